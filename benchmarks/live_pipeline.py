@@ -0,0 +1,194 @@
+"""Headless benchmark of the live-view frame path.
+
+Runs capture -> preprocess -> predict -> overlay for a fixed number of frames at
+each resolution, without Tk or a camera, and reports FPS, p50/p95/p99 latency per
+stage and process memory. Results are written as JSON to benchmarks/results and
+compared against the previous run (or --baseline) to spot regressions.
+
+    python benchmarks/live_pipeline.py --resolutions 640x480,1280x720 --frames 300
+    python benchmarks/live_pipeline.py --source video:session.mp4 --model none
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from config import Settings  # noqa: E402
+from core.preprocessing import FramePreprocessor, model_input_shape  # noqa: E402
+from core.rendering import PREVIEW_SIZE, FrameComposer, prediction_texts  # noqa: E402
+from core.sources import SyntheticSource, VideoFileSource, parse_resolution  # noqa: E402
+
+STAGES = ('capture', 'preprocess', 'predict', 'overlay', 'to_pil', 'total')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+class ConstantModel:
+    # Stand-in for runs that should measure everything except the network
+    name = 'none'
+
+    def predict(self, batch):
+        return np.array([[0.3, 0.7]], dtype=np.float32)
+
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def open_benchmark_source(spec, resolution):
+    # Sources are read as fast as possible so the benchmark measures processing, not the camera rate
+    if spec == 'synthetic':
+        return SyntheticSource(resolution, fps=0)
+    if spec.startswith('video:'):
+        return VideoFileSource(spec[len('video:'):], loop=True, realtime=False)
+    raise ValueError(f'Unknown benchmark source {spec}')
+
+
+def run(source, backend, image_dimensions, frames, warmup):
+    from PIL import Image
+
+    preprocessor = FramePreprocessor(image_dimensions)
+    composer = FrameComposer()
+    timings = {stage: [] for stage in STAGES}
+    wall_start = None
+    for i in range(warmup + frames):
+        if i == warmup:
+            wall_start = time.perf_counter()
+        t0 = time.perf_counter()
+        ok, frame = source.read()
+        if not ok:
+            raise IOError('Frame source stopped delivering frames')
+        t1 = time.perf_counter()
+        batch = preprocessor(frame)
+        t2 = time.perf_counter()
+        predictions = backend.predict(batch)
+        class_pred = int(predictions[0].argmax())
+        t3 = time.perf_counter()
+        im_color = composer.compose(frame, PREVIEW_SIZE, prediction_texts(class_pred, float(predictions[0][class_pred])))
+        t4 = time.perf_counter()
+        Image.frombuffer('RGB', PREVIEW_SIZE, im_color, 'raw', 'RGB', 0, 1)
+        t5 = time.perf_counter()
+        if i >= warmup:
+            for stage, seconds in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4, t5 - t0)):
+                timings[stage].append(seconds * 1000)
+    wall = time.perf_counter() - wall_start
+    return {
+        'fps': frames / wall,
+        'rss_mb': rss_mb(),
+        'stages_ms': {stage: {f'p{q}': float(np.percentile(values, q)) for q in (50, 95, 99)}
+                      for stage, values in timings.items()},
+    }
+
+
+def environment():
+    versions = {'python': platform.python_version(), 'numpy': np.__version__, 'opencv': cv2.__version__}
+    try:
+        import tensorflow as tf
+        versions['tensorflow'] = tf.__version__
+    except ImportError:
+        pass
+    return {'platform': platform.platform(), 'machine': platform.machine(), 'cpus': os.cpu_count(), 'versions': versions}
+
+
+def previous_result(exclude):
+    paths = sorted(p for p in glob.glob(os.path.join(RESULTS_DIR, 'live_pipeline-*.json')) if p != exclude)
+    return paths[-1] if paths else None
+
+
+def compare(current, baseline, tolerance):
+    # Returns human-readable regressions: FPS drops or p95 latency growth beyond tolerance (a fraction)
+    regressions = []
+    for key, run_result in current['runs'].items():
+        old = baseline.get('runs', {}).get(key)
+        if old is None:
+            continue
+        change = run_result['fps'] / old['fps'] - 1
+        print(f"{key}: {old['fps']:.1f} -> {run_result['fps']:.1f} FPS ({change * 100:+.1f}%)")
+        if change < -tolerance:
+            regressions.append(f'{key} FPS dropped {-change * 100:.1f}%')
+        for stage in STAGES:
+            before = old['stages_ms'][stage]['p95']
+            after = run_result['stages_ms'][stage]['p95']
+            if before > 0 and after / before - 1 > tolerance and after - before > 0.1:
+                regressions.append(f'{key} {stage} p95 {before:.2f} -> {after:.2f} ms')
+    return regressions
+
+
+def main():
+    settings = Settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resolutions', default='640x480,1280x720,1920x1080')
+    parser.add_argument('--source', default='synthetic', help="'synthetic' or 'video:PATH'")
+    parser.add_argument('--model', default=None, help="model file, or 'none' for a constant predictor "
+                                                      "(default: Settings.model_name if it exists)")
+    parser.add_argument('--backend', default=settings.inference_backend)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--baseline', default=None, help='result file to compare against (default: previous run)')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='allowed relative slowdown before flagging')
+    parser.add_argument('--output', default=None, help='where to write the result JSON')
+    args = parser.parse_args()
+
+    model_path = args.model if args.model is not None else (settings.model_name if os.path.exists(settings.model_name) else 'none')
+    if model_path == 'none':
+        backend = ConstantModel()
+    else:
+        from core.model_cache import ModelCache
+        backend = ModelCache().get(model_path, args.backend, model_input_shape(settings.image_dimensions))
+
+    result = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'source': args.source,
+        'model': model_path,
+        'backend': backend.name,
+        'image_dimensions': list(settings.image_dimensions),
+        'frames': args.frames,
+        'environment': environment(),
+        'runs': {},
+    }
+    for text in args.resolutions.split(','):
+        resolution = parse_resolution(text)
+        source = open_benchmark_source(args.source, resolution)
+        try:
+            run_result = run(source, backend, settings.image_dimensions, args.frames, args.warmup)
+        finally:
+            source.release()
+        result['runs'][text] = run_result
+        print(f"{text}: {run_result['fps']:.1f} FPS, RSS {run_result['rss_mb']:.0f} MB")
+        print(f"  {'stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for stage, q in run_result['stages_ms'].items():
+            print(f"  {stage:<12}{q['p50']:>10.2f}{q['p95']:>10.2f}{q['p99']:>10.2f}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"live_pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(result, file, indent=2)
+    print(f'Results written to {output}')
+
+    baseline_path = args.baseline or previous_result(os.path.abspath(output))
+    if baseline_path:
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+        print(f'Comparing with {baseline_path}')
+        regressions = compare(result, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION: {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
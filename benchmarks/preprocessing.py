@@ -0,0 +1,67 @@
+"""Micro-benchmark of the per-frame preprocessing used by live view.
+
+Compares the old inline path (cvtColor, resize, float64 / 255, reshape) with
+core.preprocessing.FramePreprocessor, reporting time per frame and the peak
+transient memory allocated while processing a frame (traced with tracemalloc).
+
+    python benchmarks/preprocessing.py --resolution 1280x720 --dimensions 224x224
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.preprocessing import FramePreprocessor  # noqa: E402
+from core.sources import parse_resolution  # noqa: E402
+
+
+def legacy(frame, image_dimensions):
+    im = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    im = cv2.resize(im, image_dimensions)
+    im = im / 255
+    return im.reshape(1, image_dimensions[1], image_dimensions[0], 1)
+
+
+def measure(fn, frames, iterations):
+    fn(frames[0])  # warm up lazily allocated buffers
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(frames[i % len(frames)])
+    elapsed = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    for i in range(iterations):
+        fn(frames[i % len(frames)])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resolution', type=parse_resolution, default=(1280, 720), help='camera frame size WxH')
+    parser.add_argument('--dimensions', type=parse_resolution, default=(224, 224), help='model image_dimensions WxH')
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(0)
+    frames = [rng.randint(0, 256, (args.resolution[1], args.resolution[0], 3), dtype=np.uint8) for _ in range(4)]
+    preprocessor = FramePreprocessor(args.dimensions)
+
+    if not np.array_equal(legacy(frames[0], args.dimensions).astype(np.float32), preprocessor(frames[0])):
+        print('warning: outputs differ between the legacy and shared paths')
+
+    print(f'{args.resolution[0]}x{args.resolution[1]} frame -> {args.dimensions[0]}x{args.dimensions[1]} model input')
+    print(f'{"path":<20}{"us/frame":>12}{"peak bytes/frame":>18}')
+    for name, fn in (('legacy (float64)', lambda f: legacy(f, args.dimensions)), ('FramePreprocessor', preprocessor)):
+        elapsed, peak = measure(fn, frames, args.iterations)
+        print(f'{name:<20}{elapsed * 1e6:>12.1f}{peak:>18}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Measures cold start-up of the Tk app in fresh interpreters.
+
+Fails when the median time to first paint exceeds the budget or when a heavy
+dependency is imported before the start page is shown. Requires a display.
+
+    python benchmarks/startup.py --runs 5 --budget 1.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('tensorflow', 'cv2', 'sklearn', 'pygame', 'numpy')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.PostureApp()
+app.update()  # process pending events so the start page is drawn
+shown = time.perf_counter()
+app.on_close()
+print(json.dumps({
+    'import_s': imported - start,
+    'first_paint_s': shown - start,
+    'heavy_modules': [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def run_once():
+    process = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, capture_output=True, text=True)
+    if process.returncode != 0:
+        sys.exit(f'Start-up probe failed (a display is required):\n{process.stderr}')
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=1.0, help='maximum median seconds to first paint')
+    args = parser.parse_args()
+
+    results = [run_once() for _ in range(args.runs)]
+    import_times = [r['import_s'] for r in results]
+    paint_times = [r['first_paint_s'] for r in results]
+    heavy = sorted({m for r in results for m in r['heavy_modules']})
+    median_paint = statistics.median(paint_times)
+
+    print(f'import main:  median {statistics.median(import_times) * 1000:.0f} ms')
+    print(f'first paint:  median {median_paint * 1000:.0f} ms, max {max(paint_times) * 1000:.0f} ms (budget {args.budget * 1000:.0f} ms)')
+    print(f'heavy modules loaded at start-up: {", ".join(heavy) or "none"}')
+
+    if heavy or median_paint > args.budget:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,13 @@
 import json
 
+# Choices offered on the settings page. They live here rather than next to the code that uses them so the
+# page can list them without importing OpenCV, NumPy or TensorFlow.
+BACKENDS = ('keras', 'function', 'tflite', 'service')
+CAPTURE_FORMATS = ('png', 'jpeg', 'resized')
+CAMERA_CODECS = ('default', 'mjpeg', 'yuyv')
+QUANTIZATION_MODES = ('none', 'dynamic', 'int8')
+ARCHITECTURES = ('baseline', 'gap', 'separable')
+
 class Settings:
     def __init__(self):
         self.image_dimensions = (224, 224)
@@ -7,6 +15,35 @@ class Settings:
         self.model_name = 'posture_model.h5'
         self.training_dir = 'train'
         self.mp3file = 'default.mp3'
+        self.inference_backend = 'function'
+        self.capture_fps = 1.0
+        self.capture_format = 'png'
+        self.jpeg_quality = 90
+        self.validation_split = 0.1
+        self.early_stopping_patience = 0  # 0 disables early stopping
+        self.save_best_checkpoint = False
+        self.motion_threshold = 4.0  # 0 runs the model on every frame
+        self.motion_max_stale_frames = 15
+        self.motion_min_inference_hz = 2.0
+        self.frame_source = 'webcam'  # 'webcam', 'synthetic[:WxH[@fps]]' or a video file path
+        self.camera_index = 0
+        self.camera_resolution = (640, 480)  # None keeps the driver default
+        self.camera_fps = 30.0  # 0 keeps the driver default
+        self.camera_codec = 'mjpeg'  # 'default', 'mjpeg' or 'yuyv'
+        self.camera_buffer_size = 1  # 0 keeps the driver default
+        self.show_stats_overlay = False
+        self.metrics_dump_path = ''  # .csv for CSV rows, anything else for JSON lines; empty disables
+        self.metrics_dump_interval = 10.0
+        self.display_fps = 30.0
+        self.bad_posture_seconds = 5.0  # bad posture lasting this long starts the alert
+        self.good_posture_seconds = 3.0  # good posture lasting this long clears it
+        self.service_address = '127.0.0.1:8765'  # host:port of serve.py for the 'service' backend
+        self.incremental_training = False  # fine-tune the existing model on new images instead of retraining
+        self.replay_ratio = 1.0  # older images replayed per new image when fine-tuning
+        self.dedup_threshold = 1.5  # frames within this mean grey-level difference of a recent saved one are skipped; 0 keeps all
+        self.dedup_history = 8  # how many recently saved frames each new frame is compared with
+        self.architecture = 'baseline'  # 'baseline', 'gap' or 'separable'
+        self.quantization = 'none'  # 'none', 'dynamic' or 'int8'; live view then loads the quantized .tflite
         self.load_settings()
 
     def load_settings(self):
@@ -18,6 +55,36 @@ class Settings:
                 self.model_name = settings.get('model_name', self.model_name)
                 self.training_dir = settings.get('training_dir', self.training_dir)
                 self.mp3file = settings.get('mp3file', self.mp3file)
+                self.inference_backend = settings.get('inference_backend', self.inference_backend)
+                self.capture_fps = settings.get('capture_fps', self.capture_fps)
+                self.capture_format = settings.get('capture_format', self.capture_format)
+                self.jpeg_quality = settings.get('jpeg_quality', self.jpeg_quality)
+                self.validation_split = settings.get('validation_split', self.validation_split)
+                self.early_stopping_patience = settings.get('early_stopping_patience', self.early_stopping_patience)
+                self.save_best_checkpoint = settings.get('save_best_checkpoint', self.save_best_checkpoint)
+                self.motion_threshold = settings.get('motion_threshold', self.motion_threshold)
+                self.motion_max_stale_frames = settings.get('motion_max_stale_frames', self.motion_max_stale_frames)
+                self.motion_min_inference_hz = settings.get('motion_min_inference_hz', self.motion_min_inference_hz)
+                self.frame_source = settings.get('frame_source', self.frame_source)
+                self.camera_index = settings.get('camera_index', self.camera_index)
+                camera_resolution = settings.get('camera_resolution', self.camera_resolution)
+                self.camera_resolution = tuple(camera_resolution) if camera_resolution else None
+                self.camera_fps = settings.get('camera_fps', self.camera_fps)
+                self.camera_codec = settings.get('camera_codec', self.camera_codec)
+                self.camera_buffer_size = settings.get('camera_buffer_size', self.camera_buffer_size)
+                self.show_stats_overlay = settings.get('show_stats_overlay', self.show_stats_overlay)
+                self.metrics_dump_path = settings.get('metrics_dump_path', self.metrics_dump_path)
+                self.metrics_dump_interval = settings.get('metrics_dump_interval', self.metrics_dump_interval)
+                self.display_fps = settings.get('display_fps', self.display_fps)
+                self.bad_posture_seconds = settings.get('bad_posture_seconds', self.bad_posture_seconds)
+                self.good_posture_seconds = settings.get('good_posture_seconds', self.good_posture_seconds)
+                self.service_address = settings.get('service_address', self.service_address)
+                self.incremental_training = settings.get('incremental_training', self.incremental_training)
+                self.replay_ratio = settings.get('replay_ratio', self.replay_ratio)
+                self.dedup_threshold = settings.get('dedup_threshold', self.dedup_threshold)
+                self.dedup_history = settings.get('dedup_history', self.dedup_history)
+                self.architecture = settings.get('architecture', self.architecture)
+                self.quantization = settings.get('quantization', self.quantization)
         except FileNotFoundError:
             pass
 
@@ -27,7 +94,36 @@ class Settings:
             "epochs": self.epochs,
             "model_name": self.model_name,
             "training_dir": self.training_dir,
-            "mp3file": self.mp3file
+            "mp3file": self.mp3file,
+            "inference_backend": self.inference_backend,
+            "capture_fps": self.capture_fps,
+            "capture_format": self.capture_format,
+            "jpeg_quality": self.jpeg_quality,
+            "validation_split": self.validation_split,
+            "early_stopping_patience": self.early_stopping_patience,
+            "save_best_checkpoint": self.save_best_checkpoint,
+            "motion_threshold": self.motion_threshold,
+            "motion_max_stale_frames": self.motion_max_stale_frames,
+            "motion_min_inference_hz": self.motion_min_inference_hz,
+            "frame_source": self.frame_source,
+            "camera_index": self.camera_index,
+            "camera_resolution": self.camera_resolution,
+            "camera_fps": self.camera_fps,
+            "camera_codec": self.camera_codec,
+            "camera_buffer_size": self.camera_buffer_size,
+            "show_stats_overlay": self.show_stats_overlay,
+            "metrics_dump_path": self.metrics_dump_path,
+            "metrics_dump_interval": self.metrics_dump_interval,
+            "display_fps": self.display_fps,
+            "bad_posture_seconds": self.bad_posture_seconds,
+            "good_posture_seconds": self.good_posture_seconds,
+            "service_address": self.service_address,
+            "incremental_training": self.incremental_training,
+            "replay_ratio": self.replay_ratio,
+            "dedup_threshold": self.dedup_threshold,
+            "dedup_history": self.dedup_history,
+            "architecture": self.architecture,
+            "quantization": self.quantization
         }
         with open("settings.json", "w") as file:
             json.dump(settings, file)
@@ -0,0 +1,156 @@
+import os
+import queue
+import threading
+import time
+
+BAD_POSTURE = 1  # class index the model uses for bad posture
+
+
+class AlertEngine:
+    # Posture alert state machine on its own thread. The frame loop only submits predictions; timers,
+    # debouncing and audio run here, and the Tk thread drains `events` ('alert' / 'clear') to update widgets.
+    # The alert sound is decoded once into a pygame Sound and only reloaded when the file changes.
+    def __init__(self, bad_seconds=5.0, good_seconds=3.0):
+        self.bad_seconds = bad_seconds
+        self.good_seconds = good_seconds
+        self.events = queue.Queue()
+        self.commands = queue.Queue()
+        self.thread = None
+        self.watching = False
+        self.bad = None  # last reported posture: True, False or None before the first prediction
+        self.bad_since = None
+        self.good_since = None
+        self.alerting = False
+        self.sound = None
+        self.sound_key = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def configure(self, bad_seconds, good_seconds, sound_path):
+        self.start()
+        self.commands.put(('configure', (bad_seconds, good_seconds, sound_path)))
+
+    def set_watching(self, watching):
+        self.commands.put(('watch', watching))
+
+    def submit(self, class_pred):
+        self.commands.put(('prediction', class_pred == BAD_POSTURE))
+
+    def silence(self):
+        # Stops the sound; the alert fires again after another bad_seconds of bad posture
+        self.commands.put(('silence', None))
+
+    def reset(self):
+        self.commands.put(('reset', None))
+
+    def close(self):
+        if self.thread is not None:
+            self.commands.put(('close', None))
+            self.thread.join(timeout=1)
+            self.thread = None
+
+    def _run(self):
+        while True:
+            try:
+                kind, value = self.commands.get(timeout=self._next_deadline(time.monotonic()))
+            except queue.Empty:
+                kind, value = None, None  # a timer expired
+            if kind == 'close':
+                self._stop_sound()
+                return
+            try:
+                self._handle(kind, value)
+            except Exception as e:
+                print(f'Posture alert failed: {e}')
+            self._update(time.monotonic())
+
+    def _handle(self, kind, value):
+        if kind == 'configure':
+            self.bad_seconds, self.good_seconds, sound_path = value
+            self._load_sound(sound_path)
+        elif kind == 'watch':
+            self.watching = value
+            if not value:
+                self._reset()
+        elif kind == 'prediction':
+            self.bad = value
+        elif kind == 'silence':
+            self._stop_sound()
+            self.alerting = False
+            self.bad_since = None
+            self.good_since = None
+            self.events.put('clear')
+        elif kind == 'reset':
+            self._reset()
+
+    def _reset(self):
+        self.bad = None
+        self.bad_since = None
+        self.good_since = None
+        if self.alerting:
+            self.alerting = False
+            self._stop_sound()
+            self.events.put('clear')
+
+    def _update(self, now):
+        if not self.watching or self.bad is None:
+            return
+        if self.bad:
+            self.good_since = None
+            if self.bad_since is None:
+                self.bad_since = now
+            if not self.alerting and now - self.bad_since >= self.bad_seconds:
+                self.alerting = True
+                self._play_sound()
+                self.events.put('alert')
+        else:
+            self.bad_since = None
+            if not self.alerting:
+                self.good_since = None
+                return
+            if self.good_since is None:
+                self.good_since = now
+            if now - self.good_since >= self.good_seconds:
+                self.alerting = False
+                self.good_since = None
+                self._stop_sound()
+                self.events.put('clear')
+
+    def _next_deadline(self, now):
+        # How long to wait for the next command before a timer needs re-checking (None blocks)
+        if not self.watching or self.bad is None:
+            return None
+        if self.bad and not self.alerting and self.bad_since is not None:
+            return max(self.bad_since + self.bad_seconds - now, 0.0)
+        if not self.bad and self.alerting and self.good_since is not None:
+            return max(self.good_since + self.good_seconds - now, 0.0)
+        return None
+
+    def _load_sound(self, path):
+        key = (os.path.abspath(path), os.path.getmtime(path)) if os.path.exists(path) else (path, None)
+        if key == self.sound_key:
+            return
+        import pygame  # Loaded on the alert thread so the pages never wait for the audio stack
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        if self.sound is not None:
+            self.sound.stop()
+        self.sound = None
+        self.sound_key = key
+        try:
+            self.sound = pygame.mixer.Sound(path)  # Decoded into memory once
+        except (pygame.error, FileNotFoundError) as e:
+            print(f'Could not load alert sound {path}: {e}')
+        if self.alerting:
+            self._play_sound()
+
+    def _play_sound(self):
+        if self.sound is not None:
+            self.sound.play(loops=-1)  # Keeps playing until posture is good again or the user stops it
+
+    def _stop_sound(self):
+        if self.sound is not None:
+            self.sound.stop()
@@ -0,0 +1,99 @@
+import os
+import time
+
+import numpy as np
+
+from core.inference import FunctionBackend
+
+# Selectable classifiers for the posture model. All take a (height, width, 1) grayscale image:
+#   baseline  - the original conv stack with Flatten -> Dense(64); at 224x224 the Flatten feeds ~170k
+#               values into the Dense layer, which holds nearly all of the parameters
+#   gap       - the same conv stack with a global-average-pooling head instead of Flatten
+#   separable - strided conv stem and depthwise-separable blocks that halve the resolution each step
+
+
+def _conv_stack(model, input_shape):
+    from tensorflow.keras import layers
+    model.add(layers.Conv2D(32, (3, 3), activation='relu', input_shape=input_shape))
+    model.add(layers.MaxPooling2D((2, 2)))
+    model.add(layers.Conv2D(64, (3, 3), activation='relu'))
+    model.add(layers.MaxPooling2D((2, 2)))
+    model.add(layers.Conv2D(64, (3, 3), activation='relu'))
+
+
+def build_model(architecture, input_shape, n_classes):
+    from tensorflow.keras import layers, models
+    model = models.Sequential()
+    if architecture == 'baseline':
+        _conv_stack(model, input_shape)
+        model.add(layers.Flatten())
+        model.add(layers.Dense(64, activation='relu'))
+    elif architecture == 'gap':
+        _conv_stack(model, input_shape)
+        model.add(layers.GlobalAveragePooling2D())
+        model.add(layers.Dense(64, activation='relu'))
+    elif architecture == 'separable':
+        model.add(layers.Conv2D(16, (3, 3), strides=2, padding='same', activation='relu', input_shape=input_shape))
+        for filters in (32, 64, 128):
+            model.add(layers.SeparableConv2D(filters, (3, 3), strides=2, padding='same', activation='relu'))
+        model.add(layers.GlobalAveragePooling2D())
+    else:
+        raise ValueError(f'Unknown architecture: {architecture}')
+    model.add(layers.Dense(n_classes, activation='softmax'))
+    model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    return model
+
+
+def count_flops(model):
+    # Forward-pass FLOPs for one image (a multiply-add counts as 2) from the layer shapes.
+    # Only convolutions and dense layers are counted; pooling and activations are negligible next to them.
+    from tensorflow.keras import layers
+    flops = 0
+    for layer in model.layers:
+        input_shape, output_shape = layer.input_shape, layer.output_shape
+        if isinstance(layer, layers.SeparableConv2D):
+            kh, kw = layer.kernel_size
+            channels = input_shape[-1] * layer.depth_multiplier
+            positions = output_shape[1] * output_shape[2]
+            flops += 2 * positions * channels * (kh * kw + output_shape[-1])
+        elif isinstance(layer, layers.DepthwiseConv2D):
+            kh, kw = layer.kernel_size
+            flops += 2 * output_shape[1] * output_shape[2] * output_shape[-1] * kh * kw
+        elif isinstance(layer, layers.Conv2D):
+            kh, kw = layer.kernel_size
+            flops += 2 * output_shape[1] * output_shape[2] * output_shape[-1] * kh * kw * input_shape[-1]
+        elif isinstance(layer, layers.Dense):
+            flops += 2 * input_shape[-1] * output_shape[-1]
+    return flops
+
+
+def measure_latency(model, input_shape, runs=50):
+    # Median single-frame latency through the same tf.function path live view uses by default
+    backend = FunctionBackend(model, input_shape)
+    batch = np.zeros((1,) + tuple(input_shape), dtype=np.float32)
+    backend.predict(batch)  # trace
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        backend.predict(batch)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def model_cost(model, input_shape, model_path=None, runs=50):
+    cost = {
+        'params': int(model.count_params()),
+        'flops': int(count_flops(model)),
+        'latency_ms': measure_latency(model, input_shape, runs) * 1000,
+    }
+    if model_path is not None and os.path.exists(model_path):
+        cost['file_kb'] = os.path.getsize(model_path) / 1024
+    return cost
+
+
+def format_cost(architecture, cost):
+    text = (f"{architecture}: {cost['params'] / 1e6:.2f}M params, {cost['flops'] / 1e6:.0f} MFLOPs, "
+            f"{cost['latency_ms']:.1f} ms/frame")
+    if 'file_kb' in cost:
+        text += f", {cost['file_kb'] / 1024:.1f} MB file"
+    return text
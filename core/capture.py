@@ -0,0 +1,102 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from config import CAPTURE_FORMATS
+from core.dedup import DuplicateFilter
+from core.pipeline import LatestSlot
+from core.preprocessing import to_model_image
+
+
+class FrameWriter:
+    # Encodes and writes frames on a thread pool. At most max_pending frames wait in memory;
+    # when the disk falls behind, new frames are dropped instead of slowing the capture loop.
+    # Every written file is recorded in the dataset manifest, if one is given.
+    def __init__(self, capture_format='png', jpeg_quality=90, image_dimensions=(224, 224), workers=2, max_pending=16,
+                 manifest=None):
+        if capture_format not in CAPTURE_FORMATS:
+            raise ValueError(f"Unknown capture format: {capture_format}")
+        self.capture_format = capture_format
+        self.jpeg_quality = jpeg_quality
+        self.image_dimensions = tuple(image_dimensions)
+        self.manifest = manifest
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='frame-writer')
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.error = None
+
+    def submit(self, frame, path_stem):
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.dropped += 1
+            return False
+        self.executor.submit(self._write, frame, path_stem)
+        return True
+
+    def _write(self, frame, path_stem):
+        try:
+            captured = time.time()
+            if self.capture_format == 'jpeg':
+                path = f'{path_stem}.jpg'
+                ok = cv2.imwrite(path, frame, [cv2.IMWRITE_JPEG_QUALITY, int(self.jpeg_quality)])
+            elif self.capture_format == 'resized':
+                frame = to_model_image(frame, self.image_dimensions)  # Exactly what live view feeds the model
+                path = f'{path_stem}.png'
+                ok = cv2.imwrite(path, frame)
+            else:
+                path = f'{path_stem}.png'
+                ok = cv2.imwrite(path, frame)
+            if not ok:
+                raise IOError(f'Cannot write frame {path_stem}')
+            if self.manifest is not None:
+                self.manifest.add(path, frame.shape[1], frame.shape[0], captured)
+            with self.lock:
+                self.written += 1
+        except Exception as e:
+            self.error = e
+        finally:
+            self.slots.release()
+
+    def close(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+
+class CaptureLoop(threading.Thread):
+    # Reads the camera continuously for the preview and hands a frame to the writer at the target rate,
+    # skipping frames the duplicate filter considers copies of what was just saved
+    def __init__(self, videocapture, writer, output_folder, fps, start_index=0, duplicates=None):
+        super().__init__(daemon=True)
+        self.videocapture = videocapture
+        self.writer = writer
+        self.output_folder = output_folder
+        self.interval = 1.0 / fps
+        self.index = start_index
+        self.duplicates = duplicates if duplicates is not None else DuplicateFilter(threshold=0)
+        self.preview = LatestSlot()
+        self.stop_event = threading.Event()
+
+    def run(self):
+        next_save = time.perf_counter()
+        while not self.stop_event.is_set():
+            ok, frame = self.videocapture.read()
+            if not ok or frame is None:
+                time.sleep(0.01)
+                continue
+            now = time.perf_counter()
+            if now >= next_save:
+                if self.duplicates.check(frame) and self.writer.submit(frame, f'{self.output_folder}/{self.index:08}'):
+                    self.duplicates.accept()  # Only a frame the writer took becomes a duplicate reference
+                    self.index += 1
+                next_save += self.interval
+                if next_save < now:
+                    next_save = now + self.interval  # Skip missed slots rather than bursting to catch up
+            self.preview.put(frame)
+
+    def stop(self, timeout=2.0):
+        self.stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
@@ -0,0 +1,72 @@
+import os
+
+import cv2
+import numpy as np
+
+from core.manifest import MANIFEST_NAME, open_manifest
+from core.preprocessing import model_input_shape, preprocess_batch, to_model_image
+
+BATCH_SIZE = 32
+
+
+def list_training_files(training_dir, rescan=False):
+    # Returns the class folder names and, for every image, its path and class index. Reads the dataset
+    # manifest when training_dir has one (rescan first reconciles it with files added or deleted by hand);
+    # other directories are scanned, in the same sorted class order.
+    if os.path.exists(os.path.join(training_dir, MANIFEST_NAME)):
+        manifest = open_manifest(training_dir)
+        if rescan:
+            manifest.sync()
+        return manifest.training_files()
+    class_folders = sorted(c for c in os.listdir(training_dir)
+                           if not c.startswith('.') and os.path.isdir(os.path.join(training_dir, c)))
+    paths = []
+    labels = []
+    for class_index, c in enumerate(class_folders):
+        for f in sorted(os.listdir(f'{training_dir}/{c}')):
+            paths.append(f'{training_dir}/{c}/{f}')
+            labels.append(class_index)
+    return class_folders, paths, np.array(labels, dtype=np.int32)
+
+
+def load_image(path, image_dimensions):
+    # Decodes one image as uint8 grayscale at the model's input size, the same way live view does
+    im = cv2.imread(path, cv2.IMREAD_COLOR)
+    if im is None:
+        raise IOError(f'Cannot read image {path}')
+    return to_model_image(im, image_dimensions)
+
+
+def make_cached_dataset(images, labels, batch_size=BATCH_SIZE, shuffle=True, indices=None, threads=None):
+    # Gathers whole batches of preprocessed uint8 rows from a DatasetCache memory map and normalises each
+    # batch to float32 with preprocess_batch, so peak memory is bounded by the batch and prefetch size;
+    # indices restricts the dataset to a subset of rows (e.g. a validation split), threads caps the
+    # tf.data thread pool for processes that share the machine
+    import tensorflow as tf
+
+    if indices is None:
+        indices = np.arange(len(labels))
+
+    height, width = images.shape[1:]
+    shape = (height, width, 1)
+
+    def gather(indices):
+        return preprocess_batch(images[indices], (width, height)), labels[indices]
+
+    def load_batch(indices):
+        batch_images, batch_labels = tf.numpy_function(gather, [indices], (tf.float32, tf.int32))
+        batch_images = tf.ensure_shape(batch_images, (None,) + shape)
+        batch_labels = tf.ensure_shape(batch_labels, (None,))
+        return batch_images, batch_labels
+
+    dataset = tf.data.Dataset.from_tensor_slices(np.asarray(indices, dtype=np.int64))
+    if shuffle:
+        dataset = dataset.shuffle(len(indices), reshuffle_each_iteration=True)
+    dataset = dataset.batch(batch_size)
+    dataset = dataset.map(load_batch, num_parallel_calls=tf.data.experimental.AUTOTUNE)
+    if threads:
+        options = tf.data.Options()
+        options.experimental_threading.private_threadpool_size = threads
+        options.experimental_threading.max_intra_op_parallelism = 1
+        dataset = dataset.with_options(options)
+    return dataset.prefetch(tf.data.experimental.AUTOTUNE)
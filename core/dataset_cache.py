@@ -0,0 +1,179 @@
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from core.dataset import load_image
+from core.preprocessing import model_input_shape
+
+CACHE_DIR = '.cache'
+
+
+class CachedImages:
+    # Read-only view of a DatasetCache in the order update() was given: item i is the uint8 (height, width)
+    # image of paths[i], read from the memory-mapped cache file through a path -> row index. Pickles as the
+    # file path and the index, so worker processes map the same file instead of receiving a copy.
+    def __init__(self, path, n_rows, image_shape, rows):
+        self.path = path
+        self.n_rows = n_rows
+        self.image_shape = tuple(image_shape)
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            if self.n_rows == 0:
+                self._data = np.empty((0,) + self.image_shape, dtype=np.uint8)
+            else:
+                self._data = np.memmap(self.path, dtype=np.uint8, mode='r', shape=(self.n_rows,) + self.image_shape)
+        return self._data
+
+    @property
+    def shape(self):
+        return (len(self.rows),) + self.image_shape
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        return self.data[self.rows[index]]
+
+    def take(self, indices):
+        # The subset of items at indices, still backed by the cache file
+        return CachedImages(self.path, self.n_rows, self.image_shape, self.rows[indices])
+
+    def __iter__(self):
+        for row in self.rows:
+            yield self.data[row]
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_data'] = None
+        return state
+
+
+class DatasetCache:
+    # Preprocessed uint8 grayscale images in a raw, memory-mapped file, with a manifest of the source path,
+    # mtime and row of every image. New and modified images are decoded and appended; cached rows are never
+    # rewritten, so adding images to one class does not move the rows of another. The file is compacted
+    # only once most of its rows belong to images that are gone or were re-decoded.
+    def __init__(self, training_dir, image_dimensions):
+        self.image_dimensions = tuple(image_dimensions)
+        self.image_shape = model_input_shape(self.image_dimensions)[:2]
+        self.frame_bytes = self.image_shape[0] * self.image_shape[1]
+        self.cache_dir = os.path.join(training_dir, CACHE_DIR)
+        suffix = f'{self.image_dimensions[0]}x{self.image_dimensions[1]}'
+        self.images_path = os.path.join(self.cache_dir, f'images_{suffix}.u8')
+        self.manifest_path = os.path.join(self.cache_dir, f'manifest_{suffix}.json')
+
+    def _load_manifest(self):
+        # Returns ({path: {'mtime', 'index'}}, rows in use); rows past that count are leftovers of an
+        # update that was interrupted before it wrote the manifest
+        if not (os.path.exists(self.manifest_path) and os.path.exists(self.images_path)):
+            return {}, 0
+        try:
+            with open(self.manifest_path, 'r') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return {}, 0
+        if tuple(manifest.get('image_dimensions', ())) != self.image_dimensions or 'rows' not in manifest:
+            return {}, 0
+        if os.path.getsize(self.images_path) < manifest['rows'] * self.frame_bytes:
+            return {}, 0
+        return manifest.get('entries', {}), manifest['rows']
+
+    def _write_manifest(self, paths, mtimes, rows, n_rows):
+        manifest = {
+            'image_dimensions': list(self.image_dimensions),
+            'rows': int(n_rows),
+            'entries': {path: {'mtime': mtime, 'index': int(row)} for path, mtime, row in zip(paths, mtimes, rows)},
+        }
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(manifest, file)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _remove_other_dimensions(self):
+        # Caches built for other image dimensions can never be reused once the setting changes
+        keep = {os.path.basename(self.images_path), os.path.basename(self.manifest_path)}
+        for name in os.listdir(self.cache_dir):
+            if name not in keep:
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def _decode(self, paths, items, images, workers):
+        # Decodes paths[i] into images[j] for every (i, j) in items
+        def preprocess(item):
+            images[item[1]] = load_image(paths[item[0]], self.image_dimensions)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(preprocess, items))  # OpenCV releases the GIL while decoding
+        images.flush()
+
+    def update(self, paths, workers=None, keep_other_dimensions=False):
+        # Returns CachedImages with one item per path, in the order given. keep_other_dimensions
+        # is for callers such as sweep.py that use caches for several image sizes at once.
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if not keep_other_dimensions:
+            self._remove_other_dimensions()
+        entries, n_rows = self._load_manifest()
+        mtimes = [os.path.getmtime(path) for path in paths]
+
+        rows = np.empty(len(paths), dtype=np.int64)
+        missing = []
+        for i, (path, mtime) in enumerate(zip(paths, mtimes)):
+            entry = entries.get(path)
+            if entry is not None and entry['mtime'] == mtime:
+                rows[i] = entry['index']
+            else:
+                missing.append(i)
+
+        if not missing and len(entries) == len(paths):
+            print(f'Dataset cache: {len(paths)} images up to date')
+            return CachedImages(self.images_path, n_rows, self.image_shape, rows)
+
+        print(f'Dataset cache: reusing {len(paths) - len(missing)} images, preprocessing {len(missing)}')
+        if n_rows + len(missing) > 2 * max(len(paths), 1):
+            return self._compact(paths, mtimes, rows, missing, n_rows, workers)
+
+        if missing:
+            # Drops the rows of an interrupted update, then maps only the appended region
+            with open(self.images_path, 'ab') as file:
+                file.truncate(n_rows * self.frame_bytes)
+                file.truncate((n_rows + len(missing)) * self.frame_bytes)
+            appended = np.memmap(self.images_path, dtype=np.uint8, mode='r+', offset=n_rows * self.frame_bytes,
+                                 shape=(len(missing),) + self.image_shape)
+            self._decode(paths, [(i, j) for j, i in enumerate(missing)], appended, workers)
+            del appended
+            rows[missing] = n_rows + np.arange(len(missing))
+            n_rows += len(missing)
+        self._write_manifest(paths, mtimes, rows, n_rows)
+        return CachedImages(self.images_path, n_rows, self.image_shape, rows)
+
+    def _compact(self, paths, mtimes, rows, missing, n_rows, workers):
+        # Rewrites the file with exactly one row per path, in order
+        tmp_path = self.images_path + '.tmp'
+        images = np.memmap(tmp_path, dtype=np.uint8, mode='w+', shape=(max(len(paths), 1),) + self.image_shape)
+        reused = np.setdiff1d(np.arange(len(paths)), missing)
+        if len(reused):
+            old_images = np.memmap(self.images_path, dtype=np.uint8, mode='r', shape=(n_rows,) + self.image_shape)
+            for start in range(0, len(reused), 1024):  # in chunks, so memory stays bounded
+                chunk = reused[start:start + 1024]
+                images[chunk] = old_images[rows[chunk]]
+            del old_images
+        self._decode(paths, [(i, i) for i in missing], images, workers)
+        del images
+
+        # Drop the old manifest first so an interrupted update forces a rebuild rather than mismatched rows
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+        os.replace(tmp_path, self.images_path)
+        rows = np.arange(len(paths))
+        self._write_manifest(paths, mtimes, rows, len(paths))
+        return CachedImages(self.images_path, len(paths), self.image_shape, rows)
+
+    def invalidate(self):
+        if os.path.exists(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
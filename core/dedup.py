@@ -0,0 +1,83 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from core.manifest import MANIFEST_NAME, open_manifest
+from core.motion import thumbnail
+
+
+class DuplicateFilter:
+    # Drops frames that are near-copies of a recently kept one, using the same measure as MotionGate:
+    # mean absolute difference of 32x24 grayscale thumbnails, in grey levels (0-255). 0 keeps everything.
+    def __init__(self, threshold=1.5, history=8, size=(32, 24)):
+        self.threshold = threshold
+        self.size = size
+        self.recent = deque(maxlen=history)
+        self.buffer = np.empty((size[1], size[0]), dtype=np.float32)
+        self.candidate = None
+        self.kept = 0
+        self.dropped = 0
+
+    def check(self, image):
+        # True if the frame is not a near-copy of a recently kept one. Nothing is recorded until accept(),
+        # so a frame that passes but is then not saved does not suppress the frames after it.
+        self.candidate = None
+        if self.threshold <= 0:
+            return True
+        small = thumbnail(image, self.size)
+        for reference in self.recent:
+            cv2.absdiff(small, reference, dst=self.buffer)
+            if float(self.buffer.mean()) <= self.threshold:
+                self.dropped += 1
+                return False
+        self.candidate = small
+        return True
+
+    def accept(self):
+        # Records the frame that last passed check() as saved, making it a reference for the following ones
+        if self.candidate is not None:
+            self.recent.append(self.candidate)
+            self.candidate = None
+        self.kept += 1
+
+    def keep(self, image):
+        # check() and accept() in one step, for callers that save every frame that passes
+        if not self.check(image):
+            return False
+        self.accept()
+        return True
+
+
+def _read_gray(path):
+    # Decoding at a quarter of the size is plenty for a 32x24 thumbnail and much faster
+    return cv2.imread(path, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+
+
+def prune_duplicates(training_dir, threshold=1.5, history=8, dry_run=False, workers=None):
+    # Applies DuplicateFilter to every class folder in frame order (file names are frame indices) and
+    # deletes the dropped files (and their manifest entries). Returns {class folder: (kept, dropped)}.
+    results = {}
+    removed = []
+    for folder in sorted(os.listdir(training_dir)):
+        folder_path = os.path.join(training_dir, folder)
+        if folder.startswith('.') or not os.path.isdir(folder_path):
+            continue
+        paths = [os.path.join(folder_path, f) for f in sorted(os.listdir(folder_path))]
+        paths = [p for p in paths if os.path.isfile(p)]
+        duplicates = DuplicateFilter(threshold, history)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for path, image in zip(paths, executor.map(_read_gray, paths)):
+                if image is None:
+                    continue  # not an image; leave it alone
+                if not duplicates.keep(image) and not dry_run:
+                    os.remove(path)
+                    removed.append(path)
+        results[folder] = (duplicates.kept, duplicates.dropped)
+    if removed and os.path.exists(os.path.join(training_dir, MANIFEST_NAME)):
+        manifest = open_manifest(training_dir)
+        manifest.remove(removed)
+        manifest.compact()
+    return results
@@ -0,0 +1,65 @@
+import json
+import os
+
+import numpy as np
+
+# What a trained model has seen, kept in a sidecar next to it, so training can fine-tune on new images only.
+# Images are identified by path and mtime: after Clear Images, capture numbering starts again at 0 and a new
+# frame can reuse the path of one the model was trained on.
+
+
+def metadata_path_for(model_path):
+    return os.path.splitext(model_path)[0] + '.meta.json'
+
+
+def save_metadata(model_path, class_folders, image_dimensions, architecture, paths):
+    # Sidecar describing what the model at model_path was trained on; incremental training compares against it
+    metadata = {
+        'classes': list(class_folders),
+        'image_dimensions': list(image_dimensions),
+        'architecture': architecture,
+        'images': {path: os.path.getmtime(path) for path in sorted(paths)},
+    }
+    with open(metadata_path_for(model_path), 'w') as file:
+        json.dump(metadata, file)
+
+
+def remove_metadata(model_path):
+    path = metadata_path_for(model_path)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def load_metadata(model_path):
+    try:
+        with open(metadata_path_for(model_path), 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def plan_incremental(model_path, class_folders, image_dimensions, architecture, paths, replay_ratio=1.0, seed=None):
+    # Returns (indices into paths to fine-tune on, None); (None, reason) when a full retrain is needed; or
+    # (an empty selection, reason) when there is nothing new to fine-tune on.
+    # The selection is every image the model has not seen plus replay_ratio times as many older images,
+    # which keeps the model from drifting towards whatever the latest session captured.
+    if not os.path.exists(model_path):
+        return None, 'no existing model'
+    metadata = load_metadata(model_path)
+    if metadata is None or 'images' not in metadata:
+        return None, 'the existing model has no training metadata'
+    if metadata['classes'] != list(class_folders):
+        return None, 'class folders changed'
+    if tuple(metadata['image_dimensions']) != tuple(image_dimensions):
+        return None, 'image dimensions changed'
+    if metadata['architecture'] != architecture:
+        return None, 'architecture changed'
+    seen = metadata['images']
+    is_new = np.array([seen.get(path) != os.path.getmtime(path) for path in paths], dtype=bool)
+    new = np.flatnonzero(is_new)
+    if not len(new):
+        return new, 'no new images since the last training'
+    old = np.flatnonzero(~is_new)
+    n_replay = min(len(old), int(np.ceil(len(new) * replay_ratio)))
+    replay = np.random.RandomState(seed).choice(old, n_replay, replace=False) if n_replay else old[:0]
+    return np.sort(np.concatenate([new, replay])), None
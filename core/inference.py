@@ -0,0 +1,136 @@
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+
+class InferenceBackend:
+    name = None
+
+    def __init__(self, input_shape, window=100):
+        self.input_shape = tuple(input_shape)  # (height, width, channels) of a single image
+        self.latencies = deque(maxlen=window)
+
+    def predict(self, batch):
+        start = time.perf_counter()
+        predictions = self._predict(batch)
+        self.latencies.append(time.perf_counter() - start)
+        return predictions
+
+    def _predict(self, batch):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def mean_latency_ms(self):
+        if not self.latencies:
+            return 0.0
+        return sum(self.latencies) / len(self.latencies) * 1000
+
+
+class KerasBackend(InferenceBackend):
+    # The original path: model.predict builds a data adapter on every call
+    name = 'keras'
+
+    def __init__(self, model, input_shape):
+        super().__init__(input_shape)
+        self.model = model
+
+    def _predict(self, batch):
+        return self.model.predict(batch)
+
+
+class FunctionBackend(InferenceBackend):
+    # Calls the model directly through a tf.function traced once for a fixed float32 batch of one
+    name = 'function'
+
+    def __init__(self, model, input_shape):
+        super().__init__(input_shape)
+        import tensorflow as tf
+        self.model = model
+        self._function = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec((1,) + self.input_shape, tf.float32)],
+        )
+
+    def _predict(self, batch):
+        return self._function(batch).numpy()
+
+
+class TFLiteBackend(InferenceBackend):
+    # Runs a .tflite file as-is (e.g. a quantized export) or converts the Keras model first.
+    # Fully int8 models take and return quantized tensors, so the float batch is mapped through
+    # the input's scale/zero point and the output is mapped back.
+    name = 'tflite'
+
+    def __init__(self, model_path, input_shape, model=None):
+        super().__init__(input_shape)
+        if model_path.endswith('.tflite'):
+            self.tflite_path = model_path
+        else:
+            self.tflite_path = export_tflite(model_path, model)
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+        self.interpreter = Interpreter(model_path=self.tflite_path)
+        input_detail = self.interpreter.get_input_details()[0]
+        self.interpreter.resize_tensor_input(input_detail['index'], (1,) + self.input_shape)
+        self.interpreter.allocate_tensors()
+        self._input_index = input_detail['index']
+        output_detail = self.interpreter.get_output_details()[0]
+        self._output_index = output_detail['index']
+        self._input_dtype = input_detail['dtype']
+        self._input_quantization = input_detail['quantization']
+        self._output_quantization = output_detail['quantization'] if output_detail['dtype'] != np.float32 else None
+        self._quantized_input = None
+        if self._input_dtype != np.float32:
+            self._quantized_input = np.empty((1,) + self.input_shape, dtype=self._input_dtype)
+
+    def _predict(self, batch):
+        if self._quantized_input is not None:
+            scale, zero_point = self._input_quantization
+            info = np.iinfo(self._input_dtype)
+            np.copyto(self._quantized_input, np.clip(np.round(batch / scale + zero_point), info.min, info.max),
+                      casting='unsafe')
+            batch = self._quantized_input
+        self.interpreter.set_tensor(self._input_index, batch)
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self._output_index)
+        if self._output_quantization is not None:
+            scale, zero_point = self._output_quantization
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+
+def tflite_path_for(model_path):
+    return os.path.splitext(model_path)[0] + '.tflite'
+
+
+def export_tflite(model_path, model=None):
+    # Converts the Keras model file to TFLite, reusing the export while it is newer than the source
+    tflite_path = tflite_path_for(model_path)
+    if os.path.exists(tflite_path) and os.path.getmtime(tflite_path) >= os.path.getmtime(model_path):
+        return tflite_path
+    import tensorflow as tf
+    if model is None:
+        model = tf.keras.models.load_model(model_path)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    with open(tflite_path, 'wb') as file:
+        file.write(converter.convert())
+    return tflite_path
+
+
+def create_backend(name, model_path, input_shape, model=None):
+    if name == 'tflite' or model_path.endswith('.tflite'):
+        return TFLiteBackend(model_path, input_shape, model)
+    if model is None:
+        from tensorflow.keras import models
+        model = models.load_model(model_path)
+    if name == 'keras':
+        return KerasBackend(model, input_shape)
+    if name == 'function':
+        return FunctionBackend(model, input_shape)
+    raise ValueError(f"Unknown inference backend: {name}")
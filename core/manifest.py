@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+import time
+
+MANIFEST_NAME = 'manifest.jsonl'
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+CLASS_FOLDERS = ('action_01', 'action_02')  # good and bad posture, labels 0 and 1
+
+_open_manifests = {}
+_open_lock = threading.Lock()
+
+
+def open_manifest(training_dir):
+    # One shared, loaded manifest per training directory, so the capture writer and the pages see the same state
+    key = os.path.abspath(training_dir)
+    with _open_lock:
+        manifest = _open_manifests.get(key)
+        if manifest is None:
+            manifest = _open_manifests[key] = DatasetManifest(training_dir).load()
+        return manifest
+
+
+class DatasetManifest:
+    # Index of the captured images in training_dir/manifest.jsonl: one JSON line per change ('add' with the
+    # image's class, capture time, size in bytes and dimensions; 'remove'), so the capture writer only appends.
+    # Loading replays the log instead of listing every class folder. Directories without a manifest are scanned
+    # once to create it; sync() reconciles the index with files added or deleted outside the app. Labels always
+    # include CLASS_FOLDERS, even before a class has images, so action_01 (good) is 0 and action_02 (bad) is 1.
+    def __init__(self, training_dir):
+        self.training_dir = training_dir
+        self.path = os.path.join(training_dir, MANIFEST_NAME)
+        self.lock = threading.Lock()
+        self.entries = {}  # 'class/file name' -> entry
+        self.log_lines = 0
+
+    def load(self):
+        with self.lock:
+            self.entries = {}
+            if not os.path.exists(self.path):
+                self._rebuild()
+                return self
+            with open(self.path, 'r') as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by a crash
+                    self._apply(record)
+                    self.log_lines += 1
+        return self
+
+    def _apply(self, record):
+        op = record.get('op')
+        if op == 'add':
+            self.entries[record['path']] = {k: v for k, v in record.items() if k != 'op'}
+        elif op == 'remove':
+            self.entries.pop(record['path'], None)
+
+    def _append(self, records):
+        os.makedirs(self.training_dir, exist_ok=True)
+        with open(self.path, 'a') as file:
+            for record in records:
+                file.write(json.dumps(record) + '\n')
+        self.log_lines += len(records)
+
+    def _class_folders(self):
+        if not os.path.isdir(self.training_dir):
+            return []
+        return [c for c in sorted(os.listdir(self.training_dir))
+                if not c.startswith('.') and os.path.isdir(os.path.join(self.training_dir, c))]
+
+    def _list_images(self, class_name):
+        class_dir = os.path.join(self.training_dir, class_name)
+        return [f'{class_name}/{name}' for name in sorted(os.listdir(class_dir))
+                if name.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(os.path.join(class_dir, name))]
+
+    def _scan(self, key):
+        # Entry for an image found on disk; reads only the image header for the dimensions
+        from PIL import Image
+        path = os.path.join(self.training_dir, key)
+        try:
+            with Image.open(path) as image:
+                width, height = image.size
+        except OSError:
+            return None
+        stat = os.stat(path)
+        return {'path': key, 'class': key.split('/', 1)[0], 'time': stat.st_mtime,
+                'bytes': stat.st_size, 'width': width, 'height': height}
+
+    def _rebuild(self):
+        # One-off scan of an existing directory
+        for class_name in self._class_folders():
+            for key in self._list_images(class_name):
+                entry = self._scan(key)
+                if entry is not None:
+                    self.entries[key] = entry
+        if self.entries or os.path.isdir(self.training_dir):
+            self._write_compacted()
+
+    def _write_compacted(self):
+        os.makedirs(self.training_dir, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            for entry in self.entries.values():
+                file.write(json.dumps(dict(entry, op='add')) + '\n')
+        os.replace(tmp_path, self.path)
+        self.log_lines = len(self.entries)
+
+    def add(self, path, width, height, captured=None):
+        # path is the image file inside training_dir/<class>/ that was just written
+        class_name = os.path.basename(os.path.dirname(path))
+        key = f'{class_name}/{os.path.basename(path)}'
+        entry = {'path': key, 'class': class_name, 'time': captured or time.time(),
+                 'bytes': os.path.getsize(path), 'width': width, 'height': height}
+        with self.lock:
+            self.entries[key] = entry
+            self._append([dict(entry, op='add')])
+
+    def remove(self, paths):
+        keys = [f'{os.path.basename(os.path.dirname(p))}/{os.path.basename(p)}' for p in paths]
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+            self._append([{'op': 'remove', 'path': key} for key in keys])
+
+    def clear(self, class_names):
+        # Deletes every file in the given class folders, indexed or not, and rewrites the manifest without them
+        with self.lock:
+            removed = 0
+            for class_name in class_names:
+                class_dir = os.path.join(self.training_dir, class_name)
+                if not os.path.isdir(class_dir):
+                    continue
+                for name in os.listdir(class_dir):
+                    path = os.path.join(class_dir, name)
+                    if os.path.isfile(path):
+                        os.remove(path)
+                        removed += 1
+            for key in [k for k, e in self.entries.items() if e['class'] in class_names]:
+                del self.entries[key]
+            self._write_compacted()
+        return removed
+
+    def compact(self):
+        with self.lock:
+            if self.log_lines > len(self.entries):
+                self._write_compacted()
+
+    def sync(self):
+        # Adds images copied into the class folders outside the app and forgets ones deleted outside it.
+        # Costs one directory listing per class folder plus a header read per new image.
+        # Returns (added, removed) counts.
+        with self.lock:
+            indexed = set(self.entries)
+        on_disk = {key for class_name in self._class_folders() for key in self._list_images(class_name)}
+        added = [entry for entry in (self._scan(key) for key in sorted(on_disk - indexed)) if entry is not None]
+        missing = sorted(indexed - on_disk)
+        with self.lock:
+            for entry in added:
+                self.entries[entry['path']] = entry
+            for key in missing:
+                self.entries.pop(key, None)
+            if added or missing:
+                self._append([dict(entry, op='add') for entry in added] +
+                             [{'op': 'remove', 'path': key} for key in missing])
+        return len(added), len(missing)
+
+    def classes(self):
+        # The fixed class folders plus any other folder holding images, in sorted name order
+        with self.lock:
+            return sorted(set(CLASS_FOLDERS) | {entry['class'] for entry in self.entries.values()})
+
+    def counts(self):
+        counts = {}
+        with self.lock:
+            for entry in self.entries.values():
+                counts[entry['class']] = counts.get(entry['class'], 0) + 1
+        return counts
+
+    def next_index(self, class_name):
+        # Continue numbering after the highest existing frame so a new session never overwrites old ones
+        with self.lock:
+            indices = [int(stem) for stem in (os.path.splitext(key.split('/', 1)[1])[0]
+                                              for key, entry in self.entries.items() if entry['class'] == class_name)
+                       if stem.isdigit()]
+        return max(indices) + 1 if indices else 0
+
+    def training_files(self):
+        # Same shape as core.dataset.list_training_files: class names, image paths and int32 labels
+        import numpy as np
+        class_names = self.classes()
+        label_of = {name: i for i, name in enumerate(class_names)}
+        with self.lock:
+            keys = sorted(self.entries, key=lambda k: (label_of[self.entries[k]['class']], k))
+            labels = [label_of[self.entries[k]['class']] for k in keys]
+        paths = [f'{self.training_dir}/{key}' for key in keys]
+        return class_names, paths, np.array(labels, dtype=np.int32)
@@ -0,0 +1,120 @@
+import csv
+import json
+import os
+import socket
+import threading
+import time
+from collections import deque
+
+# Rolling per-stage timings and event rates for the live pipeline. Recording is a perf_counter
+# difference appended to a bounded deque (thread-safe for append), so it is cheap enough for every frame.
+
+STAGES = ('capture', 'motion', 'preprocess', 'predict', 'overlay', 'display')
+RATES = ('capture', 'inference', 'display')
+
+
+class RollingTimer:
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def summary(self):
+        values = sorted(self.samples)
+        if not values:
+            return {'mean_ms': 0.0, 'p95_ms': 0.0}
+        return {
+            'mean_ms': sum(values) / len(values) * 1000,
+            'p95_ms': values[min(int(len(values) * 0.95), len(values) - 1)] * 1000,
+        }
+
+
+class RateMeter:
+    # Events per second over the last `seconds`
+    def __init__(self, seconds=2.0):
+        self.seconds = seconds
+        self.events = deque()
+        self.lock = threading.Lock()
+
+    def tick(self, now=None):
+        now = time.perf_counter() if now is None else now
+        with self.lock:
+            self.events.append(now)
+            while self.events and now - self.events[0] > self.seconds:
+                self.events.popleft()
+
+    def rate(self, now=None):
+        now = time.perf_counter() if now is None else now
+        with self.lock:
+            while self.events and now - self.events[0] > self.seconds:
+                self.events.popleft()
+            if len(self.events) < 2:
+                return 0.0
+            return (len(self.events) - 1) / max(self.events[-1] - self.events[0], 1e-9)
+
+
+class PipelineMetrics:
+    def __init__(self, window=120):
+        self.timers = {stage: RollingTimer(window) for stage in STAGES}
+        self.rates = {name: RateMeter() for name in RATES}
+
+    def record(self, stage, seconds):
+        self.timers[stage].record(seconds)
+
+    def tick(self, name):
+        self.rates[name].tick()
+
+    def snapshot(self):
+        return {
+            'fps': {name: meter.rate() for name, meter in self.rates.items()},
+            'stages': {stage: timer.summary() for stage, timer in self.timers.items()},
+        }
+
+    def overlay_lines(self):
+        snapshot = self.snapshot()
+        fps = snapshot['fps']
+        lines = ['FPS cap {capture:.0f} inf {inference:.0f} disp {display:.0f}'.format(**fps)]
+        for stage, summary in snapshot['stages'].items():
+            lines.append(f"{stage:<10} {summary['mean_ms']:6.1f} ms")
+        return lines
+
+
+class MetricsDumper:
+    # Appends a snapshot every `interval` seconds to a .csv file (one flat row per dump) or to any
+    # other path as JSON lines; rows carry the host name so files from many machines can be merged
+    def __init__(self, metrics, path, interval=10.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.last_dump = time.perf_counter()
+        self.host = socket.gethostname()
+
+    def maybe_dump(self, extra=None):
+        now = time.perf_counter()
+        if now - self.last_dump < self.interval:
+            return False
+        self.last_dump = now
+        self.dump(extra)
+        return True
+
+    def dump(self, extra=None):
+        snapshot = self.metrics.snapshot()
+        record = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'host': self.host}
+        record.update(extra or {})
+        if self.path.lower().endswith('.csv'):
+            for name, value in snapshot['fps'].items():
+                record[f'{name}_fps'] = round(value, 2)
+            for stage, summary in snapshot['stages'].items():
+                for key, value in summary.items():
+                    record[f'{stage}_{key}'] = round(value, 3)
+            write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, 'a', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=list(record))
+                if write_header:
+                    writer.writeheader()
+                writer.writerow(record)
+        else:
+            record.update(snapshot)
+            with open(self.path, 'a') as file:
+                file.write(json.dumps(record) + '\n')
@@ -0,0 +1,63 @@
+import os
+import threading
+
+# main imports this module at start-up, so the core modules it uses (which pull in NumPy and OpenCV)
+# are imported where they are first needed
+
+
+class ModelCache:
+    # Keeps loaded, warmed-up inference backends keyed by model path and file mtime,
+    # so a model is only read from disk again after training rewrites it
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def _key(self, model_path, backend_name, input_shape):
+        return (os.path.abspath(model_path), backend_name, tuple(input_shape))
+
+    def get(self, model_path, backend_name, input_shape):
+        key = self._key(model_path, backend_name, input_shape)
+        mtime = os.path.getmtime(model_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+            from core.inference import create_backend
+            backend = create_backend(backend_name, model_path, input_shape)
+            self._warm_up(backend)
+            self._entries[key] = (mtime, backend)
+            return backend
+
+    def _warm_up(self, backend):
+        # The first call pays for graph tracing / tensor allocation; keep it out of the latency stats
+        import numpy as np
+        backend.predict(np.zeros((1,) + backend.input_shape, dtype=np.float32))
+        backend.latencies.clear()
+
+    def get_for_settings(self, settings):
+        from core.preprocessing import model_input_shape
+        from core.quantization import live_model_path
+        input_shape = model_input_shape(settings.image_dimensions)
+        if settings.inference_backend == 'service':
+            # One connection per live session and nothing to load locally; the caller closes it
+            from core.service import ServiceBackend
+            return ServiceBackend(settings.service_address, input_shape)
+        return self.get(live_model_path(settings), settings.inference_backend, input_shape)
+
+    def warm_up_async(self, settings):
+        # The imports and the model load both run on the thread, so calling this from the Tk thread costs nothing
+        if settings.inference_backend == 'service':
+            return None
+        thread = threading.Thread(target=self._warm_up_quietly, args=(settings,), daemon=True)
+        thread.start()
+        return thread
+
+    def _warm_up_quietly(self, settings):
+        try:
+            from core.preprocessing import model_input_shape
+            from core.quantization import live_model_path
+            model_path = live_model_path(settings)
+            if os.path.exists(model_path):
+                self.get(model_path, settings.inference_backend, model_input_shape(settings.image_dimensions))
+        except Exception as e:
+            print(f'Model warm-up failed: {e}')
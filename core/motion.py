@@ -0,0 +1,47 @@
+import time
+
+import cv2
+import numpy as np
+
+
+def thumbnail(image, size=(32, 24)):
+    # Tiny float32 grayscale copy for cheap frame comparisons
+    small = cv2.resize(image, size, interpolation=cv2.INTER_AREA)  # shrink before converting colour
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    return small.astype(np.float32)
+
+
+class MotionGate:
+    # Cheap change detector in front of the model: a frame is only inferred when its downscaled
+    # grayscale version differs enough from the frame behind the last prediction, when the last
+    # prediction has been reused max_stale_frames times, or when min_inference_hz would be violated.
+    def __init__(self, threshold=4.0, max_stale_frames=15, min_inference_hz=2.0, size=(32, 24)):
+        self.threshold = threshold  # mean absolute difference in grey levels (0-255); 0 disables gating
+        self.max_stale_frames = max_stale_frames
+        self.min_interval = 1.0 / min_inference_hz if min_inference_hz > 0 else float('inf')
+        self.size = size
+        self.reference = None
+        self.buffer = np.empty((size[1], size[0]), dtype=np.float32)
+        self.stale_frames = 0
+        self.last_inference = 0.0
+
+    def thumbnail(self, image):
+        return thumbnail(image, self.size)
+
+    def should_infer(self, image, now=None):
+        now = time.perf_counter() if now is None else now
+        if self.threshold <= 0 or self.reference is None:
+            return True
+        if self.stale_frames >= self.max_stale_frames or now - self.last_inference >= self.min_interval:
+            return True
+        cv2.absdiff(self.thumbnail(image), self.reference, dst=self.buffer)
+        return float(self.buffer.mean()) > self.threshold
+
+    def inferred(self, image, now=None):
+        self.reference = self.thumbnail(image)
+        self.stale_frames = 0
+        self.last_inference = time.perf_counter() if now is None else now
+
+    def reused(self):
+        self.stale_frames += 1
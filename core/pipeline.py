@@ -0,0 +1,194 @@
+import threading
+import time
+from collections import deque
+
+
+class Frame:
+    def __init__(self, index, image, timestamp):
+        self.index = index
+        self.image = image
+        self.timestamp = timestamp  # time.perf_counter() when the frame was read
+
+
+class Prediction:
+    def __init__(self, frame, predictions, class_pred, conf, inference_time, reused=False):
+        self.frame = frame
+        self.predictions = predictions
+        self.class_pred = class_pred
+        self.conf = conf
+        self.inference_time = inference_time  # seconds spent in the predict function
+        self.reused = reused  # True when the motion gate skipped the model and kept the last prediction
+
+
+class LatestSlot:
+    # Holds only the newest item; writers overwrite, readers wait for something newer than they have seen
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._item = None
+        self._seq = 0
+
+    def put(self, item):
+        with self._condition:
+            self._item = item
+            self._seq += 1
+            self._condition.notify_all()
+
+    def get_newer(self, seen_seq, timeout=None):
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._seq > seen_seq, timeout):
+                return seen_seq, None
+            return self._seq, self._item
+
+    def peek(self):
+        with self._condition:
+            return self._seq, self._item
+
+    def clear(self):
+        with self._condition:
+            self._item = None
+            self._condition.notify_all()
+
+
+class CaptureThread(threading.Thread):
+    def __init__(self, videocapture, frames, stop_event, metrics=None):
+        super().__init__(daemon=True)
+        self.videocapture = videocapture
+        self.frames = frames
+        self.stop_event = stop_event
+        self.metrics = metrics
+        self.frames_read = 0
+        self.read_failures = 0
+
+    def run(self):
+        while not self.stop_event.is_set():
+            start = time.perf_counter()
+            ok, image = self.videocapture.read()
+            if not ok or image is None:
+                self.read_failures += 1
+                time.sleep(0.01)
+                continue
+            now = time.perf_counter()
+            if self.metrics is not None:
+                self.metrics.record('capture', now - start)
+                self.metrics.tick('capture')
+            self.frames.put(Frame(self.frames_read, image, now))
+            self.frames_read += 1
+
+
+class InferenceWorker(threading.Thread):
+    def __init__(self, frames, results, predict_fn, stop_event, max_frame_age=0.5, gate=None, metrics=None):
+        super().__init__(daemon=True)
+        self.frames = frames
+        self.results = results
+        self.predict_fn = predict_fn
+        self.stop_event = stop_event
+        self.max_frame_age = max_frame_age
+        self.gate = gate
+        self.metrics = metrics
+        self.frames_inferred = 0
+        self.frames_reused = 0
+        self.frames_dropped = 0
+        self.error = None
+
+    def run(self):
+        seen_seq = 0
+        last_index = None
+        last_result = None
+        while not self.stop_event.is_set():
+            seen_seq, frame = self.frames.get_newer(seen_seq, timeout=0.1)
+            if frame is None:
+                continue
+            # Frames overwritten in the slot while we were busy were never inferred
+            if last_index is not None and frame.index > last_index + 1:
+                self.frames_dropped += frame.index - last_index - 1
+            last_index = frame.index
+            if time.perf_counter() - frame.timestamp > self.max_frame_age:
+                self.frames_dropped += 1
+                continue
+            if last_result is not None and self.gate is not None and not self._should_infer(frame):
+                # Nothing moved: republish the last prediction with the new frame so timers keep ticking
+                self.gate.reused()
+                self.results.put(Prediction(frame, last_result.predictions, last_result.class_pred,
+                                            last_result.conf, 0.0, reused=True))
+                self.frames_reused += 1
+                continue
+            start = time.perf_counter()
+            try:
+                predictions = self.predict_fn(frame.image)
+            except Exception as e:
+                self.error = e
+                self.stop_event.set()
+                break
+            inference_time = time.perf_counter() - start
+            class_pred = int(predictions[0].argmax())
+            conf = float(predictions[0][class_pred])
+            last_result = Prediction(frame, predictions, class_pred, conf, inference_time)
+            if self.gate is not None:
+                self.gate.inferred(frame.image)
+            if self.metrics is not None:
+                self.metrics.tick('inference')
+            self.results.put(last_result)
+            self.frames_inferred += 1
+
+    def _should_infer(self, frame):
+        if self.metrics is None:
+            return self.gate.should_infer(frame.image)
+        start = time.perf_counter()
+        decision = self.gate.should_infer(frame.image)
+        self.metrics.record('motion', time.perf_counter() - start)
+        return decision
+
+
+class LivePipeline:
+    # Capture thread -> newest-frame slot -> inference worker -> newest-result slot -> UI render step
+    def __init__(self, videocapture, predict_fn, max_frame_age=0.5, window=100, gate=None, metrics=None):
+        self.frames = LatestSlot()
+        self.results = LatestSlot()
+        self.stop_event = threading.Event()
+        self.metrics = metrics
+        self.capture_thread = CaptureThread(videocapture, self.frames, self.stop_event, metrics)
+        self.inference_worker = InferenceWorker(self.frames, self.results, predict_fn, self.stop_event, max_frame_age,
+                                                gate, metrics)
+        self.frame_ages = deque(maxlen=window)
+        self._rendered_seq = 0
+
+    def start(self):
+        self.capture_thread.start()
+        self.inference_worker.start()
+
+    def stop(self, timeout=2.0):
+        self.stop_event.set()
+        for thread in (self.capture_thread, self.inference_worker):
+            if thread.is_alive():
+                thread.join(timeout)
+
+    @property
+    def running(self):
+        return not self.stop_event.is_set()
+
+    @property
+    def error(self):
+        return self.inference_worker.error
+
+    def next_result(self):
+        # Called from the render step; returns None when nothing new has been inferred since the last call
+        seq, result = self.results.peek()
+        if seq == self._rendered_seq or result is None:
+            return None
+        self._rendered_seq = seq
+        self.frame_ages.append(time.perf_counter() - result.frame.timestamp)
+        return result
+
+    def mean_frame_age(self):
+        if not self.frame_ages:
+            return 0.0
+        return sum(self.frame_ages) / len(self.frame_ages)
+
+    def stats(self):
+        return {
+            "frames_read": self.capture_thread.frames_read,
+            "frames_inferred": self.inference_worker.frames_inferred,
+            "frames_reused": self.inference_worker.frames_reused,
+            "frames_dropped": self.inference_worker.frames_dropped,
+            "frame_age_ms": self.mean_frame_age() * 1000,
+        }
@@ -0,0 +1,68 @@
+import cv2
+import numpy as np
+
+# Shared by live view and training so both feed the model exactly the same pixels:
+# BGR (or already grayscale) frame -> grayscale -> resize to image_dimensions -> float32 / 255.
+# image_dimensions is (width, height) as passed to cv2.resize; arrays are (height, width).
+SCALE = np.float32(255)
+
+
+def model_input_shape(image_dimensions):
+    return (image_dimensions[1], image_dimensions[0], 1)
+
+
+def to_gray(image, dst=None):
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY, dst=dst)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=dst)
+
+
+def to_model_image(image, image_dimensions, dst=None):
+    # uint8 (height, width) grayscale image at the model's resolution
+    return cv2.resize(to_gray(image), tuple(image_dimensions), dst=dst)
+
+
+def normalize(images, out=None):
+    # uint8 -> float32 in [0, 1]; vectorised over any number of images
+    return np.divide(images, SCALE, out=out, dtype=np.float32)
+
+
+class FramePreprocessor:
+    # Per-frame path for live view: every intermediate lives in a buffer allocated once, so turning a
+    # camera frame into a (1, height, width, 1) float32 batch allocates nothing after the first frame.
+    # The returned array is overwritten by the next call.
+    def __init__(self, image_dimensions):
+        self.image_dimensions = tuple(image_dimensions)
+        height, width, _ = model_input_shape(image_dimensions)
+        self.gray = None
+        self.small = np.empty((height, width), dtype=np.uint8)
+        self.batch = np.empty((1, height, width, 1), dtype=np.float32)
+
+    def __call__(self, frame):
+        if frame.ndim == 3:
+            if self.gray is None or self.gray.shape != frame.shape[:2]:
+                self.gray = np.empty(frame.shape[:2], dtype=np.uint8)
+            gray = to_gray(frame, dst=self.gray)
+        else:
+            gray = frame
+        cv2.resize(gray, self.image_dimensions, dst=self.small)
+        normalize(self.small, out=self.batch[0, :, :, 0])
+        return self.batch
+
+
+def preprocess_batch(images, image_dimensions, out=None):
+    # Batched path: many frames of any size -> (n, height, width, 1) float32. A uint8 (n, height, width)
+    # array already at the model's size, such as rows of a DatasetCache, is normalised in one step.
+    height, width, _ = model_input_shape(image_dimensions)
+    if isinstance(images, np.ndarray) and images.dtype == np.uint8 and images.shape[1:] == (height, width):
+        small = images
+    else:
+        small = np.empty((len(images), height, width), dtype=np.uint8)
+        for i, image in enumerate(images):
+            to_model_image(image, image_dimensions, dst=small[i])
+    if out is None:
+        out = np.empty((len(images), height, width, 1), dtype=np.float32)
+    normalize(small, out=out[..., 0])
+    return out
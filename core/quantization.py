@@ -0,0 +1,136 @@
+import json
+import os
+import time
+
+import numpy as np
+
+from core.inference import create_backend
+from core.preprocessing import normalize
+
+# Post-training quantization of the trained Keras model into TFLite files next to it:
+#   dynamic - int8 weights, float activations; needs no data
+#   int8    - int8 weights and activations (int8 input/output too), calibrated on sample images
+
+
+def quantized_path_for(model_path, mode):
+    return f'{os.path.splitext(model_path)[0]}.{mode}.tflite'
+
+
+def report_path_for(model_path):
+    return os.path.splitext(model_path)[0] + '.quantization.json'
+
+
+def live_model_path(settings):
+    # The quantized export is used while it is newer than the Keras model it came from;
+    # model_name may also point at a .tflite file directly
+    if settings.quantization != 'none' and os.path.exists(settings.model_name):
+        path = quantized_path_for(settings.model_name, settings.quantization)
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(settings.model_name):
+            return path
+    return settings.model_name
+
+
+def sample_indices(n, samples, seed=0):
+    if n <= samples:
+        return np.arange(n)
+    return np.sort(np.random.RandomState(seed).choice(n, samples, replace=False))
+
+
+def quantize_model(model, mode, output_path, calibration_images=None):
+    # calibration_images: uint8 (n, height, width) images as stored by DatasetCache, required for int8
+    import tensorflow as tf
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if mode == 'int8':
+        if calibration_images is None or not len(calibration_images):
+            raise ValueError('int8 quantization needs calibration images')
+
+        def representative_dataset():
+            for image in calibration_images:
+                yield [normalize(image[np.newaxis, :, :, np.newaxis])]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    elif mode != 'dynamic':
+        raise ValueError(f'Unknown quantization mode: {mode}')
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(converter.convert())
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def measure(model_path, backend_name, input_shape, images, labels=None, frames=200):
+    # File size, time until the first prediction is back, single-frame CPU latency and accuracy
+    start = time.perf_counter()
+    backend = create_backend(backend_name, model_path, input_shape)
+    batch = np.empty((1,) + tuple(input_shape), dtype=np.float32)
+    normalize(images[0], out=batch[0, :, :, 0])
+    backend.predict(batch)
+    load_seconds = time.perf_counter() - start
+
+    latencies = []
+    for i in range(frames):
+        normalize(images[i % len(images)], out=batch[0, :, :, 0])
+        t = time.perf_counter()
+        backend.predict(batch)
+        latencies.append(time.perf_counter() - t)
+
+    result = {
+        'path': model_path,
+        'backend': backend.name,
+        'size_kb': os.path.getsize(model_path) / 1024,
+        'load_ms': load_seconds * 1000,
+        'latency_p50_ms': float(np.percentile(latencies, 50)) * 1000,
+        'latency_p95_ms': float(np.percentile(latencies, 95)) * 1000,
+    }
+    if labels is not None:
+        correct = 0
+        for image, label in zip(images, labels):
+            normalize(image, out=batch[0, :, :, 0])
+            correct += int(backend.predict(batch)[0].argmax() == label)
+        result['accuracy'] = correct / len(images)
+    return result
+
+
+def compare_models(model_path, quantized_paths, input_shape, images, labels=None, frames=200):
+    # One row for the float Keras model, its float TFLite export and every quantized file
+    rows = [dict(measure(model_path, 'function', input_shape, images, labels, frames), model='keras float32'),
+            dict(measure(model_path, 'tflite', input_shape, images, labels, frames), model='tflite float32')]
+    for mode, path in quantized_paths.items():
+        rows.append(dict(measure(path, 'tflite', input_shape, images, labels, frames), model=f'tflite {mode}'))
+    return rows
+
+
+def format_report(rows):
+    lines = [f"{'model':<16}{'size KB':>10}{'load ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'accuracy':>10}"]
+    for row in rows:
+        accuracy = f"{row['accuracy'] * 100:.1f}%" if 'accuracy' in row else '-'
+        lines.append(f"{row['model']:<16}{row['size_kb']:>10.0f}{row['load_ms']:>10.0f}"
+                     f"{row['latency_p50_ms']:>9.2f}{row['latency_p95_ms']:>9.2f}{accuracy:>10}")
+    return '\n'.join(lines)
+
+
+def write_report(model_path, rows):
+    path = report_path_for(model_path)
+    with open(path, 'w') as file:
+        json.dump({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'models': rows}, file, indent=2)
+    return path
+
+
+def export_quantized(model, model_path, modes, images, labels, input_shape,
+                     calibration_samples=200, eval_samples=500, frames=200):
+    # Quantizes the freshly trained model and writes the comparison report; images/labels are the
+    # uint8 cached images, ideally held-out ones so the accuracy column means something
+    calibration = images[sample_indices(len(images), calibration_samples)]
+    quantized_paths = {mode: quantize_model(model, mode, quantized_path_for(model_path, mode), calibration)
+                       for mode in modes}
+    chosen = sample_indices(len(images), eval_samples, seed=1)
+    rows = compare_models(model_path, quantized_paths, input_shape, np.asarray(images[chosen]),
+                          None if labels is None else labels[chosen], frames)
+    report = format_report(rows)
+    print(report)
+    write_report(model_path, rows)
+    return rows, report
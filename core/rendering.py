@@ -0,0 +1,165 @@
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+# Overlay positions and font scales are given for this reference preview size and scaled to the real one
+PREVIEW_SIZE = (800, 480)
+
+
+class Text:
+    def __init__(self, text, origin, scale, color, thickness, font=cv2.FONT_HERSHEY_SIMPLEX):
+        self.key = (text, origin, scale, color, thickness, font)
+        self.text = text
+        self.origin = origin
+        self.scale = scale
+        self.color = color  # BGR, like the camera frames
+        self.thickness = thickness
+        self.font = font
+
+
+def prediction_texts(class_pred, conf):
+    if class_pred == 1:
+        posture = Text('Bad posture', (10, 70), 2, (0, 0, 255), 3)
+    else:
+        posture = Text('Good posture', (10, 70), 2, (0, 255, 0), 2)
+    msg = 'Confidence {}%'.format(round(int(conf * 100)))
+    return [posture, Text(msg, (15, 110), 1, (200, 200, 255), 2)]
+
+
+def stats_texts(lines, origin=(10, 150)):
+    return [Text(line, (origin[0], origin[1] + i * 18), 1.1, (0, 255, 255), 1, cv2.FONT_HERSHEY_PLAIN)
+            for i, line in enumerate(lines)]
+
+
+class TextCache:
+    # putText runs once per distinct (text, style, preview scale); later frames only copy the
+    # rendered glyph pixels through a mask, which touches just the text's bounding box
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    def get(self, text, factor):
+        key = text.key + (round(factor, 3),)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+        scale = text.scale * factor
+        thickness = max(int(round(text.thickness * factor)), 1)
+        (width, height), baseline = cv2.getTextSize(text.text, text.font, scale, thickness)
+        pad = thickness
+        patch = np.zeros((height + baseline + 2 * pad, width + 2 * pad, 3), dtype=np.uint8)
+        mask = np.zeros(patch.shape[:2], dtype=np.uint8)
+        anchor = (pad, pad + height)
+        cv2.putText(patch, text.text, anchor, text.font, scale, text.color, thickness)
+        cv2.putText(mask, text.text, anchor, text.font, scale, 255, thickness)
+        # Top-left corner of the patch relative to the text origin (which is the baseline-left point)
+        offset = (-pad, -(pad + height))
+        entry = (patch, mask.astype(bool)[..., np.newaxis], offset)
+        self.entries[key] = entry
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return entry
+
+    def draw(self, image, text, factor):
+        patch, mask, offset = self.get(text, factor)
+        x = int(round(text.origin[0] * factor)) + offset[0]
+        y = int(round(text.origin[1] * factor)) + offset[1]
+        # Clip the patch to the image
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + patch.shape[1], image.shape[1]), min(y + patch.shape[0], image.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return
+        px, py = x0 - x, y0 - y
+        np.copyto(image[y0:y1, x0:x1], patch[py:py + y1 - y0, px:px + x1 - x0],
+                  where=mask[py:py + y1 - y0, px:px + x1 - x0])
+
+
+class FrameComposer:
+    # Headless half of the preview: resize, mirror, overlay text and convert to RGB into buffers
+    # that are reused until the output size changes
+    def __init__(self, mirror=True):
+        self.mirror = mirror
+        self.text_cache = TextCache()
+        self.size = None
+        self.resized = None
+        self.flipped = None
+        self.rgb = None
+
+    def _allocate(self, size):
+        shape = (size[1], size[0], 3)
+        self.size = size
+        self.resized = np.empty(shape, dtype=np.uint8)
+        self.flipped = np.empty(shape, dtype=np.uint8)
+        self.rgb = np.empty(shape, dtype=np.uint8)
+
+    def compose(self, frame, size=PREVIEW_SIZE, texts=()):
+        size = tuple(size)
+        if size != self.size:
+            self._allocate(size)
+        # INTER_AREA only pays off for large reductions; below 2x bilinear looks the same and is much cheaper
+        interpolation = cv2.INTER_AREA if frame.shape[1] >= 2 * size[0] else cv2.INTER_LINEAR
+        cv2.resize(frame, size, dst=self.resized, interpolation=interpolation)
+        image = self.resized
+        if self.mirror:
+            cv2.flip(self.resized, 1, dst=self.flipped)  # flip horizontally
+            image = self.flipped
+        factor = size[0] / PREVIEW_SIZE[0]
+        for text in texts:
+            self.text_cache.draw(image, text, factor)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self.rgb)
+
+
+def fit_size(frame_shape, box):
+    # Largest size with the frame's aspect ratio that fits inside box (width, height)
+    frame_height, frame_width = frame_shape[:2]
+    scale = min(box[0] / frame_width, box[1] / frame_height)
+    return max(int(frame_width * scale), 1), max(int(frame_height * scale), 1)
+
+
+class PreviewRenderer:
+    # Tk half of the preview: renders at the label's current size, keeps a single PhotoImage that is
+    # updated in place with paste(), and limits how often a frame is drawn to max_fps
+    def __init__(self, label, max_fps=30.0, mirror=True, default_size=PREVIEW_SIZE):
+        self.label = label
+        self.label.configure(borderwidth=0, highlightthickness=0, padx=0, pady=0)
+        self.composer = FrameComposer(mirror)
+        self.set_max_fps(max_fps)
+        self.default_size = default_size
+        self.photo = None
+        self.last_render = 0.0
+
+    def set_max_fps(self, max_fps):
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+
+    def due(self, now=None):
+        now = time.perf_counter() if now is None else now
+        return now - self.last_render >= self.min_interval
+
+    def box_size(self):
+        width, height = self.label.winfo_width(), self.label.winfo_height()
+        if width <= 1 or height <= 1:  # not mapped yet
+            return self.default_size
+        return width, height
+
+    def compose(self, frame, texts=()):
+        return self.composer.compose(frame, fit_size(frame.shape, self.box_size()), texts)
+
+    def show(self, rgb):
+        from PIL import Image, ImageTk
+
+        height, width = rgb.shape[:2]
+        image = Image.frombuffer('RGB', (width, height), rgb, 'raw', 'RGB', 0, 1)
+        if self.photo is None or (self.photo.width(), self.photo.height()) != (width, height):
+            self.photo = ImageTk.PhotoImage(image=image)
+            self.label.imgtk = self.photo
+            self.label.configure(image=self.photo)
+        else:
+            self.photo.paste(image)
+        self.last_render = time.perf_counter()
+
+    def reset(self):
+        self.photo = None
+        self.last_render = 0.0
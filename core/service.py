@@ -0,0 +1,233 @@
+import json
+import queue
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+from core.inference import InferenceBackend
+from core.preprocessing import SCALE, normalize
+
+# Local inference service: one process holds the model and answers frames from many live views, batching
+# frames that arrive within max_wait of each other into one model call.
+#
+# Wire format over TCP (all integers big-endian):
+#   server -> client on connect: u32 length + JSON hello {"input_shape": [h, w, 1], "classes": n}
+#   client -> server: u32 request id + h*w uint8 pixels (the model image before the /255 scaling)
+#   server -> client: u32 request id + n float32 class probabilities
+# Sending uint8 instead of the float32 batch is 4x less data and exact: FramePreprocessor's float values
+# are pixel / 255, so rounding batch * 255 recovers the pixels.
+
+DEFAULT_ADDRESS = '127.0.0.1:8765'
+_ID = struct.Struct('!I')
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def _recv_exact(sock, buffer):
+    view = memoryview(buffer).cast('B')
+    while len(view):
+        n = sock.recv_into(view)
+        if not n:
+            raise ConnectionError('Connection closed')
+        view = view[n:]
+    return buffer
+
+
+def _recv_message(sock):
+    length = _ID.unpack(_recv_exact(sock, bytearray(_ID.size)))[0]
+    return _recv_exact(sock, bytearray(length))
+
+
+def make_batch_predictor(model, input_shape):
+    # tf.function over a variable batch dimension, so every batch size reuses one traced graph
+    import tensorflow as tf
+    function = tf.function(lambda x: model(x, training=False),
+                           input_signature=[tf.TensorSpec((None,) + tuple(input_shape), tf.float32)])
+    return lambda batch: function(batch).numpy()
+
+
+class _Request:
+    __slots__ = ('client', 'request_id', 'pixels', 'received')
+
+    def __init__(self, client, request_id, pixels):
+        self.client = client
+        self.request_id = request_id
+        self.pixels = pixels
+        self.received = time.perf_counter()
+
+
+class _Client:
+    def __init__(self, sock):
+        self.sock = sock
+        self.send_lock = threading.Lock()
+
+    def send(self, payload):
+        with self.send_lock:
+            self.sock.sendall(payload)
+
+    def disconnect(self):
+        # Wakes the reader thread, which closes the socket; the client sees the connection drop
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class InferenceService:
+    # predict_batch takes an (n, height, width, 1) float32 array and returns (n, classes) probabilities
+    def __init__(self, predict_batch, input_shape, classes, max_batch=8, max_wait=0.005):
+        self.predict_batch = predict_batch
+        self.input_shape = tuple(input_shape)
+        self.classes = classes
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self.batch = np.empty((max_batch,) + self.input_shape, dtype=np.float32)
+        self.frame_bytes = self.input_shape[0] * self.input_shape[1]
+        self.server = None
+        self.running = False
+        self.threads = []
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.frames = 0
+        self.clients = 0
+
+    def start(self, address=DEFAULT_ADDRESS):
+        self.server = socket.create_server(parse_address(address))
+        self.running = True
+        for target in (self._accept_loop, self._batch_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self.server.getsockname()
+
+    def stop(self):
+        self.running = False
+        if self.server is not None:
+            self.server.close()
+        self.requests.put(None)
+        for thread in self.threads:
+            thread.join(timeout=1)
+        self.threads = []
+
+    def stats(self):
+        with self.lock:
+            return {'clients': self.clients, 'frames': self.frames, 'batches': self.batches,
+                    'mean_batch': self.frames / self.batches if self.batches else 0.0}
+
+    def _accept_loop(self):
+        hello = json.dumps({'input_shape': list(self.input_shape), 'classes': self.classes}).encode()
+        while self.running:
+            try:
+                sock, _ = self.server.accept()
+            except OSError:
+                return  # server socket closed
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _Client(sock)
+            client.send(_ID.pack(len(hello)) + hello)
+            threading.Thread(target=self._client_loop, args=(client,), daemon=True).start()
+
+    def _client_loop(self, client):
+        with self.lock:
+            self.clients += 1
+        try:
+            while self.running:
+                request_id = _ID.unpack(_recv_exact(client.sock, bytearray(_ID.size)))[0]
+                pixels = _recv_exact(client.sock, np.empty(self.frame_bytes, dtype=np.uint8))
+                self.requests.put(_Request(client, request_id, pixels))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            client.sock.close()
+            with self.lock:
+                self.clients -= 1
+
+    def _batch_loop(self):
+        while self.running:
+            first = self.requests.get()
+            if first is None:
+                return
+            batch = [first]
+            # Waits at most max_wait after the first frame for frames from other streams. Clients keep one
+            # request in flight, so once every connected stream is in the batch there is nothing to wait for.
+            deadline = first.received + self.max_wait
+            while len(batch) < min(self.max_batch, self.clients):
+                timeout = deadline - time.perf_counter()
+                try:
+                    request = self.requests.get(timeout=timeout) if timeout > 0 else self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    self.running = False
+                    break
+                batch.append(request)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        inputs = self.batch[:len(batch)]
+        height, width, _ = self.input_shape
+        try:
+            for i, request in enumerate(batch):
+                normalize(request.pixels.reshape(height, width), out=inputs[i, :, :, 0])
+            outputs = np.asarray(self.predict_batch(inputs), dtype='>f4')
+        except Exception as e:
+            # The wire format has no error reply, so drop the affected connections rather than leave those
+            # clients waiting for their socket timeout; the batching thread carries on for everyone else
+            print(f'Inference failed for a batch of {len(batch)}: {e}')
+            for client in {request.client for request in batch}:
+                client.disconnect()
+            return
+        for request, output in zip(batch, outputs):
+            try:
+                request.client.send(_ID.pack(request.request_id) + output.tobytes())
+            except OSError:
+                pass  # the client went away; its reader thread cleans up
+        with self.lock:
+            self.batches += 1
+            self.frames += len(batch)
+
+
+class ServiceBackend(InferenceBackend):
+    # Client side: sends one frame at a time to an InferenceService and waits for its prediction
+    name = 'service'
+
+    def __init__(self, address, input_shape, timeout=5.0):
+        super().__init__(input_shape)
+        self.address = address
+        self.sock = socket.create_connection(parse_address(address), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        hello = json.loads(_recv_message(self.sock).decode())
+        if tuple(hello['input_shape']) != self.input_shape:
+            self.sock.close()
+            raise ValueError(f"Service at {address} expects input shape {tuple(hello['input_shape'])}, "
+                             f"not {self.input_shape}")
+        self.classes = hello['classes']
+        self.lock = threading.Lock()
+        self.request_id = 0
+        self.pixels = np.empty(self.input_shape[:2], dtype=np.uint8)
+        self.scaled = np.empty(self.input_shape[:2], dtype=np.float32)
+        self.header = bytearray(_ID.size)
+        self.output = np.empty(self.classes, dtype='>f4')
+
+    def _predict(self, batch):
+        with self.lock:
+            self.request_id = (self.request_id + 1) % 2 ** 32
+            # float32 rounding can leave pixel / 255 * 255 just under the integer, so round before casting
+            np.multiply(batch[0, :, :, 0], SCALE, out=self.scaled)
+            np.rint(self.scaled, out=self.scaled)
+            np.copyto(self.pixels, self.scaled, casting='unsafe')
+            self.sock.sendall(_ID.pack(self.request_id) + self.pixels.tobytes())
+            while True:
+                response_id = _ID.unpack(_recv_exact(self.sock, self.header))[0]
+                _recv_exact(self.sock, self.output)
+                if response_id == self.request_id:
+                    return self.output.astype(np.float32)[np.newaxis]
+
+    def close(self):
+        self.sock.close()
@@ -0,0 +1,174 @@
+import time
+
+import cv2
+import numpy as np
+
+# Frame sources share cv2.VideoCapture's read()/isOpened()/release() interface, so the live pipeline,
+# the capture loop and the benchmarks can run from a webcam, a recorded video or generated frames.
+# describe() reports what the source actually delivers.
+
+FOURCC = {'mjpeg': 'MJPG', 'yuyv': 'YUYV'}
+
+
+def fourcc_name(value):
+    value = int(value)
+    name = ''.join(chr((value >> 8 * i) & 0xFF) for i in range(4))
+    return name if value and name.isprintable() else '?'
+
+
+class WebcamSource:
+    # Requested properties are hints: drivers pick the nearest mode they support (or ignore the request),
+    # so negotiated() reads back what the camera settled on. 0/None/'default' keeps the driver default.
+    def __init__(self, index=0, resolution=None, fps=0, codec='default', buffer_size=0):
+        self.index = index
+        self.capture = cv2.VideoCapture(index)
+        if self.capture.isOpened():
+            # The pixel format has to be chosen before the size for V4L2 to offer the MJPEG-only modes
+            if codec in FOURCC:
+                self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*FOURCC[codec]))
+            if resolution:
+                self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, resolution[0])
+                self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, resolution[1])
+            if fps:
+                self.capture.set(cv2.CAP_PROP_FPS, fps)
+            if buffer_size:
+                # A short queue means read() returns a recent frame instead of one that waited in the driver
+                self.capture.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+    def negotiated(self):
+        return {
+            'width': int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.capture.get(cv2.CAP_PROP_FPS),
+            'codec': fourcc_name(self.capture.get(cv2.CAP_PROP_FOURCC)),
+            'buffer_size': int(self.capture.get(cv2.CAP_PROP_BUFFERSIZE)),
+        }
+
+    def describe(self):
+        n = self.negotiated()
+        buffer_size = n['buffer_size'] if n['buffer_size'] > 0 else 'default'
+        return (f"Camera {self.index}: {n['width']}x{n['height']} @ {n['fps']:.0f} fps, "
+                f"{n['codec']}, buffer {buffer_size}")
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        return self.capture.read()
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource:
+    # Plays a recording, optionally at its native frame rate and looping at the end
+    def __init__(self, path, loop=True, realtime=True):
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        self.loop = loop
+        fps = self.capture.get(cv2.CAP_PROP_FPS) if self.capture.isOpened() else 0
+        self.interval = 1.0 / fps if realtime and fps > 0 else 0.0
+        self.next_frame = time.perf_counter()
+
+    def describe(self):
+        width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        return f'Video {self.path}: {width}x{height} @ {fps:.0f} fps'
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        ok, frame = self.capture.read()
+        if not ok and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.capture.read()
+        if self.interval:
+            self.next_frame = _pace(self.next_frame, self.interval)
+        return ok, frame
+
+    def release(self):
+        self.capture.release()
+
+
+class SyntheticSource:
+    # Deterministic generated frames: a gradient background with a block that moves every frame.
+    # fps=0 produces frames as fast as they are read.
+    def __init__(self, resolution=(1280, 720), fps=30.0, seed=0):
+        self.width, self.height = resolution
+        self.interval = 1.0 / fps if fps > 0 else 0.0
+        rng = np.random.RandomState(seed)
+        gradient = np.linspace(40, 200, self.width, dtype=np.float32)
+        self.background = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        for channel in range(3):
+            self.background[..., channel] = (gradient * (0.6 + 0.2 * channel)).astype(np.uint8)
+        self.background = cv2.add(self.background, rng.randint(0, 8, self.background.shape, dtype=np.uint8))
+        self.block = (max(self.width // 6, 1), max(self.height // 3, 1))
+        self.index = 0
+        self.opened = True
+        self.next_frame = time.perf_counter()
+
+    def describe(self):
+        rate = f'{1.0 / self.interval:.0f} fps' if self.interval else 'unpaced'
+        return f'Synthetic: {self.width}x{self.height} @ {rate}'
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self):
+        if not self.opened:
+            return False, None
+        if self.interval:
+            self.next_frame = _pace(self.next_frame, self.interval)
+        frame = self.background.copy()
+        span = max(self.width - self.block[0], 1)
+        x = (self.index * 7) % span
+        y = (self.height - self.block[1]) // 2
+        frame[y:y + self.block[1], x:x + self.block[0]] = (30, 30, 30)
+        self.index += 1
+        return True, frame
+
+    def release(self):
+        self.opened = False
+
+
+def _pace(next_frame, interval):
+    # Sleeps until the next frame is due, like a camera delivering frames at a fixed rate
+    delay = next_frame - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+        return next_frame + interval
+    return time.perf_counter() + interval
+
+
+def parse_resolution(text):
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def open_source(spec, camera_index=0, resolution=None, fps=0, codec='default', buffer_size=0):
+    # 'webcam' (or a camera index), 'synthetic[:WxH[@fps]]', or the path of a video file.
+    # The remaining arguments only apply to cameras.
+    spec = str(spec).strip()
+    if spec in ('', 'webcam') or spec.isdigit():
+        index = int(spec) if spec.isdigit() else camera_index
+        source = WebcamSource(index, resolution, fps, codec, buffer_size)
+    elif spec.startswith('synthetic'):
+        resolution, fps = (1280, 720), 30.0
+        options = spec.partition(':')[2]
+        if options:
+            size, _, rate = options.partition('@')
+            resolution = parse_resolution(size)
+            fps = float(rate) if rate else fps
+        source = SyntheticSource(resolution, fps)
+    else:
+        source = VideoFileSource(spec)
+    if not source.isOpened():
+        raise IOError(f'Cannot open frame source {spec}')
+    return source
+
+
+def open_source_for_settings(settings):
+    return open_source(settings.frame_source, settings.camera_index, settings.camera_resolution,
+                       settings.camera_fps, settings.camera_codec, settings.camera_buffer_size)
@@ -0,0 +1,68 @@
+import os
+import time
+
+import numpy as np
+
+# Worker side of sweep.py. Each task trains one configuration on one cross-validation fold in its own
+# process; the parent fills a DatasetCache for every image size and the workers memory-map its file.
+
+
+def init_worker(threads):
+    # Runs once per worker process, before TensorFlow creates its thread pools
+    for name in ('OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS'):
+        os.environ[name] = str(threads)
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+
+
+def _fit(images, labels, train_indices, architecture, epochs, n_classes, threads):
+    from core.architectures import build_model
+    from core.dataset import make_cached_dataset
+    from core.training import balanced_class_weights
+
+    input_shape = tuple(images.shape[1:]) + (1,)
+    class_weights = balanced_class_weights(labels[train_indices], n_classes)
+    model = build_model(architecture, input_shape, n_classes)
+    dataset = make_cached_dataset(images, labels, indices=train_indices, threads=threads)
+    model.fit(dataset, epochs=epochs, class_weight=class_weights, verbose=0)
+    return model, input_shape
+
+
+def run_fold(task):
+    # task: images (CachedImages), labels, train/validation indices, architecture, epochs, n_classes, threads, measure_cost
+    from core.dataset import make_cached_dataset
+
+    images = task['images']
+    labels = task['labels']
+    start = time.perf_counter()
+    model, input_shape = _fit(images, labels, task['train_indices'], task['architecture'], task['epochs'],
+                              task['n_classes'], task['threads'])
+    result = {'key': task['key'], 'fold': task['fold'], 'train_seconds': time.perf_counter() - start}
+
+    val_indices = task['val_indices']
+    predictions = model.predict(make_cached_dataset(images, labels, shuffle=False, indices=val_indices,
+                                                    threads=task['threads']))
+    result['accuracy'] = float(np.mean(predictions.argmax(axis=1) == labels[val_indices]))
+
+    if task['measure_cost']:
+        import tempfile
+        from core.architectures import count_flops, measure_latency
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model.h5')
+            model.save(path)
+            result['size_kb'] = os.path.getsize(path) / 1024
+        result['params'] = int(model.count_params())
+        result['flops'] = int(count_flops(model))
+        result['latency_ms'] = measure_latency(model, input_shape) * 1000
+    return result
+
+
+def train_final(task):
+    # Retrains the winning configuration on every image and saves it to task['model_path']
+    images = task['images']
+    model, _ = _fit(images, task['labels'], np.arange(len(task['labels'])), task['architecture'], task['epochs'],
+                    task['n_classes'], task['threads'])
+    model.save(task['model_path'])
+    return task['model_path']
@@ -0,0 +1,111 @@
+import os
+import time
+
+import numpy as np
+from tensorflow import keras
+
+
+class TrainingProgress(keras.callbacks.Callback):
+    # Stops training at the next batch once stop_event is set and reports progress through report(text),
+    # which must be safe to call from the training thread
+    def __init__(self, stop_event, report, n_samples, batch_size, epochs, interval=0.25):
+        super().__init__()
+        self.stop_event = stop_event
+        self.report = report
+        self.n_samples = n_samples
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.interval = interval
+        self.steps = int(np.ceil(n_samples / batch_size))
+        self.epoch = 0
+        self.epoch_start = 0.0
+        self.last_report = 0.0
+        self.samples_per_sec = 0.0
+        self.cancelled = False
+        self.completed_epochs = 0  # epochs that ran to the end, not cut short by the stop button
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch = epoch
+        self.epoch_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        if self.stop_event.is_set():
+            self.cancelled = True
+            self.model.stop_training = True
+            return
+        now = time.perf_counter()
+        seen = min((batch + 1) * self.batch_size, self.n_samples)
+        self.samples_per_sec = seen / max(now - self.epoch_start, 1e-9)
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            loss = (logs or {}).get('loss', float('nan'))
+            self.report(f"Epoch {self.epoch + 1}/{self.epochs}, batch {batch + 1}/{self.steps}, "
+                        f"loss {loss:.4f}, {self.samples_per_sec:.0f} samples/sec")
+
+    def on_epoch_end(self, epoch, logs=None):
+        if self.cancelled:
+            return  # Keras still ends the interrupted epoch; its logs cover only part of it
+        self.completed_epochs += 1
+        logs = logs or {}
+        text = f"Epoch {epoch + 1}/{self.epochs}: loss {logs.get('loss', float('nan')):.4f}"
+        if 'accuracy' in logs:
+            text += f", accuracy {logs['accuracy']:.3f}"
+        if 'val_loss' in logs:
+            text += f", val loss {logs['val_loss']:.4f}, val accuracy {logs.get('val_accuracy', float('nan')):.3f}"
+        text += f", {self.samples_per_sec:.0f} samples/sec"
+        print(text)
+        self.report(text)
+
+
+def balanced_class_weights(labels, n_classes):
+    # Keras needs a weight for every class 0..n_classes-1; a class with no images in this fit (e.g. a fine-tuning
+    # session that only captured bad posture) gets a neutral 1.0 and the present classes are balanced
+    from sklearn.utils import class_weight
+    present = np.unique(labels)
+    weights = dict.fromkeys(range(n_classes), 1.0)
+    weights.update(zip(present.tolist(), class_weight.compute_class_weight('balanced', present, labels)))
+    return weights
+
+
+def split_indices(n, validation_split, seed=None):
+    # Random train/validation split of row indices; the validation set is empty when the split is 0
+    indices = np.random.RandomState(seed).permutation(n)
+    n_val = int(n * validation_split)
+    return np.sort(indices[n_val:]), np.sort(indices[:n_val])
+
+
+class BestEpochCheckpoint(keras.callbacks.ModelCheckpoint):
+    # Saves the best completed epoch, skipping the one the stop button interrupted: Keras still validates
+    # and ends that epoch, and with best starting at +inf it would be saved even though it saw part of the data
+    def __init__(self, progress, filepath, **kwargs):
+        super().__init__(filepath, **kwargs)
+        self.progress = progress
+
+    def on_epoch_end(self, epoch, logs=None):
+        if not self.progress.cancelled:
+            super().on_epoch_end(epoch, logs)
+
+
+def checkpoint_path_for(model_path):
+    # The checkpoint is moved over model_path only once the run is kept
+    root, ext = os.path.splitext(model_path)
+    return f'{root}.checkpoint{ext}'
+
+
+def make_callbacks(settings, progress, has_validation):
+    monitor = 'val_loss' if has_validation else 'loss'
+    callbacks = [progress]
+    checkpoint = None
+    if settings.early_stopping_patience > 0:
+        callbacks.append(keras.callbacks.EarlyStopping(monitor=monitor, patience=settings.early_stopping_patience,
+                                                       restore_best_weights=True))
+    if settings.save_best_checkpoint:
+        path = checkpoint_path_for(settings.model_name)
+        if os.path.exists(path):
+            os.remove(path)  # Left over from an interrupted run
+        checkpoint = BestEpochCheckpoint(progress, path, monitor=monitor, save_best_only=True)
+        callbacks.append(checkpoint)
+    return callbacks, checkpoint
+
+
+FINE_TUNE_LEARNING_RATE = 1e-4  # a tenth of Adam's default, so a short session nudges the model rather than resetting it
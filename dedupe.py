@@ -0,0 +1,36 @@
+"""Remove near-duplicate frames from an existing training directory.
+
+Walks every class folder in frame order and deletes frames whose 32x24
+grayscale thumbnail is within --threshold mean grey levels of one of the
+--history most recently kept frames, the same test the capture page applies
+while recording. Prints how many frames each class kept and dropped.
+
+    python dedupe.py --dry-run
+    python dedupe.py --data train --threshold 5
+"""
+import argparse
+
+from config import Settings
+from core.dedup import prune_duplicates
+
+
+def main():
+    settings = Settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default=settings.training_dir, help='directory of class folders')
+    parser.add_argument('--threshold', type=float, default=settings.dedup_threshold or 1.5)
+    parser.add_argument('--history', type=int, default=settings.dedup_history)
+    parser.add_argument('--dry-run', action='store_true', help='only report what would be deleted')
+    args = parser.parse_args()
+
+    results = prune_duplicates(args.data, args.threshold, args.history, args.dry_run)
+    print(f"{'class':<16}{'kept':>8}{'dropped':>9}")
+    for folder, (kept, dropped) in results.items():
+        print(f'{folder:<16}{kept:>8}{dropped:>9}')
+    kept = sum(k for k, _ in results.values())
+    dropped = sum(d for _, d in results.values())
+    print(f"{'total':<16}{kept:>8}{dropped:>9}" + (' (dry run, nothing deleted)' if args.dry_run else ''))
+
+
+if __name__ == '__main__':
+    main()
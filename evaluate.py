@@ -0,0 +1,155 @@
+"""Headless evaluation of a trained posture model.
+
+Runs batched inference without Tk or a camera, over a directory laid out like
+training_dir (one folder per class, e.g. action_01/action_02) or over a video
+file, and reports accuracy, a confusion matrix and throughput per batch size.
+
+    python evaluate.py --data train --batch-sizes 1,8,32
+    python evaluate.py --video session.mp4 --label 1 --every 5
+"""
+import argparse
+import json
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from config import Settings
+from core.dataset import list_training_files
+from core.dataset_cache import DatasetCache
+from core.preprocessing import model_input_shape, preprocess_batch, to_model_image
+
+
+def load_video(path, image_dimensions, every=1, limit=None):
+    videocapture = cv2.VideoCapture(path)
+    if not videocapture.isOpened():
+        raise IOError(f'Cannot open video {path}')
+    images = []
+    index = 0
+    while limit is None or len(images) < limit:
+        ok, frame = videocapture.read()
+        if not ok:
+            break
+        if index % every == 0:
+            images.append(to_model_image(frame, image_dimensions))
+        index += 1
+    videocapture.release()
+    height, width, _ = model_input_shape(image_dimensions)
+    return np.array(images, dtype=np.uint8).reshape(-1, height, width)
+
+
+def predict_all(model, images, batch_size):
+    # Returns predicted classes and the seconds spent inside the model (preprocessing excluded)
+    predictions = []
+    elapsed = 0.0
+    height, width = images.shape[1:]
+    batch = np.empty((batch_size, height, width, 1), dtype=np.float32)
+    for start in range(0, len(images), batch_size):
+        chunk = images[start:start + batch_size]
+        inputs = preprocess_batch(chunk, (width, height), out=batch[:len(chunk)])
+        t = time.perf_counter()
+        outputs = model(inputs, training=False).numpy()
+        elapsed += time.perf_counter() - t
+        predictions.append(outputs.argmax(axis=1))
+    return np.concatenate(predictions) if predictions else np.empty(0, dtype=np.int64), elapsed
+
+
+def confusion_matrix(labels, predictions, n_classes):
+    matrix = np.zeros((n_classes, n_classes), dtype=np.int64)
+    np.add.at(matrix, (labels, predictions), 1)
+    return matrix
+
+
+def main():
+    settings = Settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--data', default=None, help=f'directory of class folders (default: {settings.training_dir})')
+    source.add_argument('--video', default=None, help='video file to run inference over')
+    parser.add_argument('--rescan', action='store_true',
+                        help='pick up images added to or deleted from the class folders by hand')
+    parser.add_argument('--label', type=int, default=None, help='class index of every frame in --video, enables accuracy')
+    parser.add_argument('--every', type=int, default=1, help='use every Nth video frame')
+    parser.add_argument('--limit', type=int, default=None, help='evaluate at most this many images')
+    parser.add_argument('--model', default=settings.model_name)
+    parser.add_argument('--batch-sizes', default='1,8,32', help='comma separated batch sizes to benchmark')
+    parser.add_argument('--repeats', type=int, default=1, help='timed passes per batch size')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+    batch_sizes = [int(b) for b in args.batch_sizes.split(',')]
+
+    from tensorflow.keras import models
+    model = models.load_model(args.model)
+    image_dimensions = settings.image_dimensions
+    expected_shape = model_input_shape(image_dimensions)
+    if tuple(model.input_shape[1:]) != expected_shape:
+        sys.exit(f'Model input shape {model.input_shape[1:]} does not match image_dimensions {image_dimensions}')
+
+    start = time.perf_counter()
+    if args.video:
+        class_names = None
+        images = load_video(args.video, image_dimensions, args.every, args.limit)
+        labels = np.full(len(images), args.label, dtype=np.int64) if args.label is not None else None
+    else:
+        data = args.data or settings.training_dir
+        class_names, paths, labels = list_training_files(data, args.rescan)
+        # Memory-mapped from the training cache; every path is passed so a --limit run keeps the full cache
+        images = DatasetCache(data, image_dimensions).update(paths)
+        if args.limit is not None:
+            chosen = np.sort(np.random.RandomState(0).permutation(len(paths))[:args.limit])
+            images = images.take(chosen)
+            labels = labels[chosen]
+    load_time = time.perf_counter() - start
+    if not len(images):
+        sys.exit('No images to evaluate')
+
+    report = {
+        'model': args.model,
+        'images': int(len(images)),
+        'load_images_per_sec': len(images) / load_time,
+        'throughput': [],
+    }
+    predictions = None
+    for batch_size in batch_sizes:
+        predict_all(model, images[:batch_size], batch_size)  # trace / warm up this batch shape
+        elapsed = 0.0
+        for _ in range(args.repeats):
+            predictions, seconds = predict_all(model, images, batch_size)
+            elapsed += seconds
+        report['throughput'].append({
+            'batch_size': batch_size,
+            'images_per_sec': len(images) * args.repeats / elapsed,
+            'ms_per_batch': elapsed / (args.repeats * int(np.ceil(len(images) / batch_size))) * 1000,
+        })
+
+    if labels is not None:
+        n_classes = model.output_shape[-1]
+        matrix = confusion_matrix(labels, predictions, n_classes)
+        report['accuracy'] = float(np.trace(matrix) / matrix.sum())
+        report['confusion_matrix'] = matrix.tolist()
+        report['classes'] = class_names or [str(i) for i in range(n_classes)]
+    else:
+        report['predicted_counts'] = np.bincount(predictions, minlength=model.output_shape[-1]).tolist()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Model {report['model']}: {report['images']} images (loaded at {report['load_images_per_sec']:.0f} images/sec)")
+    if 'accuracy' in report:
+        print(f"Accuracy: {report['accuracy'] * 100:.2f}%")
+        width = max(len(c) for c in report['classes']) + 2
+        print('Confusion matrix (rows = true class, columns = predicted):')
+        print(' ' * width + ''.join(f'{c:>{width}}' for c in report['classes']))
+        for name, row in zip(report['classes'], report['confusion_matrix']):
+            print(f'{name:<{width}}' + ''.join(f'{v:>{width}}' for v in row))
+    else:
+        print(f"Predicted class counts: {report['predicted_counts']}")
+    print(f"{'batch size':>10}{'images/sec':>14}{'ms/batch':>12}")
+    for row in report['throughput']:
+        print(f"{row['batch_size']:>10}{row['images_per_sec']:>14.1f}{row['ms_per_batch']:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
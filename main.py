@@ -1,6 +1,11 @@
+import importlib
+import sys
 import tkinter as tk
-from pages import StartPage, LiveViewPage, TrainingPage, SettingsPage  # Import the pages
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+from pages import PAGE_MODULES  # Pages are imported lazily
 from config import Settings  # Import Settings
+from core.model_cache import ModelCache
 
 class PostureApp(tk.Tk):
     def __init__(self):
@@ -8,25 +13,76 @@ class PostureApp(tk.Tk):
         self.title("Pauseture")
         self.geometry("800x600")
         self.frames = {}
-        container = tk.Frame(self)
-        container.pack(side="top", fill="both", expand=True)
-        container.grid_rowconfigure(0, weight=1)
-        container.grid_columnconfigure(0, weight=1)
+        self.loading_pages = set()
+        self.container = tk.Frame(self)
+        self.container.pack(side="top", fill="both", expand=True)
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
         self.protocol("WM_DELETE_WINDOW", self.on_close)
         self.settings = Settings()  # Create an instance of Settings
-
-        for F in (StartPage, LiveViewPage, TrainingPage, SettingsPage):
-            page_name = F.__name__
-            frame = F(parent=container, controller=self, settings=self.settings)
-            self.frames[page_name] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        self.model_cache = ModelCache()
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pauseture-loader")
+        self.background_futures = set()
 
         self.show_frame("StartPage")
 
+    def run_in_background(self, on_done, fn, *args):
+        # Runs fn on a worker thread and calls on_done(future) back on the Tk thread
+        future = self.executor.submit(fn, *args)
+        self.background_futures.add(future)
+        self.after(50, self._poll_background, future, on_done)
+        return future
+
+    def _poll_background(self, future, on_done):
+        if not future.done():
+            self.after(50, self._poll_background, future, on_done)
+            return
+        self.background_futures.discard(future)
+        on_done(future)
+
+    def create_page(self, page_name):
+        F = getattr(importlib.import_module(PAGE_MODULES[page_name]), page_name)
+        frame = F(parent=self.container, controller=self, settings=self.settings)
+        self.frames[page_name] = frame
+        frame.grid(row=0, column=0, sticky="nsew")
+        return frame
+
+    def load_page(self, page_name):
+        # Import the page module off the Tk thread, then build and show it
+        if page_name in self.loading_pages:
+            return
+        self.loading_pages.add(page_name)
+        self.set_status(f"Loading {page_name}...")
+        self.run_in_background(lambda future: self._on_page_loaded(page_name, future), importlib.import_module, PAGE_MODULES[page_name])
+
+    def _on_page_loaded(self, page_name, future):
+        self.loading_pages.discard(page_name)
+        self.set_status("")
+        try:
+            future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not load {page_name}: {e}")
+            return
+        self.show_frame(page_name)
+
+    def set_status(self, text):
+        start_page = self.frames.get("StartPage")
+        if start_page is not None:
+            start_page.set_status(text)
+
     def show_frame(self, page_name):
         self.settings.load_settings()  # Reload settings
+        if page_name not in self.frames:
+            if PAGE_MODULES[page_name] not in sys.modules and self.frames:
+                self.load_page(page_name)
+                return
+            self.create_page(page_name)
         frame = self.frames[page_name]
         frame.tkraise()
+        if page_name == "TrainingPage":
+            # TensorFlow is needed from here on; load the model in the background so live view opens instantly.
+            # Live view loads it itself, and sessions that only open Settings never load TensorFlow.
+            self.model_cache.warm_up_async(self.settings)
         if page_name == "LiveViewPage":
             frame.start_camera()
         else:
@@ -37,6 +93,10 @@ class PostureApp(tk.Tk):
         for frame in self.frames.values():
             if hasattr(frame, 'on_close'):
                 frame.on_close()
+        # shutdown(cancel_futures=True) needs Python 3.9; TensorFlow 2.4 runs on 3.8 at most
+        for future in self.background_futures:
+            future.cancel()
+        self.executor.shutdown(wait=False)
         self.destroy()
 
 if __name__ == "__main__":
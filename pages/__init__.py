@@ -1,4 +1,15 @@
-from .start_page import StartPage
-from .live_view_page import LiveViewPage
-from .training_page import TrainingPage
-from .settings_page import SettingsPage  # Import SettingsPage
\ No newline at end of file
+import importlib
+
+# Pages are imported on first use so heavy dependencies (TensorFlow, OpenCV, pygame) stay out of start-up
+PAGE_MODULES = {
+    'StartPage': 'pages.start_page',
+    'LiveViewPage': 'pages.live_view_page',
+    'TrainingPage': 'pages.training_page',
+    'SettingsPage': 'pages.settings_page',
+}
+
+
+def __getattr__(name):
+    if name in PAGE_MODULES:
+        return getattr(importlib.import_module(PAGE_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
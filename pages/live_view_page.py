@@ -1,12 +1,14 @@
 import tkinter as tk
-import cv2
-import numpy as np
-from tensorflow.keras import models
-from PIL import Image, ImageTk
-import threading
+import queue
 from config import Settings  # Import Settings class
+from core.pipeline import LivePipeline
+from core.motion import MotionGate
+from core.preprocessing import FramePreprocessor
+from core.rendering import PreviewRenderer, prediction_texts, stats_texts
+from core.metrics import MetricsDumper, PipelineMetrics
+from core.sources import open_source_for_settings
+from core.alerts import AlertEngine
 import time
-import pygame  # Import pygame for playing sound
 import json
 import tkinter.messagebox  # Import messagebox for notifications
 
@@ -16,15 +18,18 @@ class LiveViewPage(tk.Frame):
         self.controller = controller
         self.settings = settings  # Use the provided settings instance
         self.label = tk.Label(self)
-        self.label.pack()
-        self.mymodel = None
+        self.label.pack(side="top", fill="both", expand=True)
+        self.renderer = PreviewRenderer(self.label, self.settings.display_fps)
+        self.backend = None
+        self.preprocessor = None
+        self.metrics = None
+        self.metrics_dumper = None
         self.videocapture = None
-        self.threads = []
-        self.bad_posture_start_time = None
-        self.good_posture_start_time = None
-        self.sound_played = False  # Add a flag to track if sound has been played
+        self.pipeline = None
+        self.render_job = None
+        self.alerts = AlertEngine(self.settings.bad_posture_seconds, self.settings.good_posture_seconds)
         self.watching = False  # Add a flag to track if watching posture
-        pygame.mixer.init()  # Initialize pygame mixer
+        self.loading_future = None
         self.warning_message = None  # Add a reference to the warning message box
 
         button_frame = tk.Frame(self)
@@ -37,6 +42,10 @@ class LiveViewPage(tk.Frame):
         self.stop_music_button.pack_forget()  # Hide initially
         self.watch_button = tk.Button(button_frame, text="Start Watching", command=self.toggle_watch)
         self.watch_button.pack(side="left", padx=5)
+        self.stats_label = tk.Label(button_frame, text="")
+        self.stats_label.pack(side="right", padx=5)
+        self.source_label = tk.Label(self, text="")
+        self.source_label.pack(side="bottom", fill="x")
 
     def on_back(self):
         self.controller.show_frame("StartPage")
@@ -44,34 +53,94 @@ class LiveViewPage(tk.Frame):
         self.reset_timers_and_music()
 
     def start_camera(self):
-        self.mymodel = models.load_model(self.settings.model_name)
-        self.videocapture = cv2.VideoCapture(0)
-        if not self.videocapture.isOpened():
-            raise IOError('Cannot open webcam')
-        thread = threading.Thread(target=self.update_frame)
-        self.threads.append(thread)
-        thread.start()
+        # Also (re)loads the alert sound on the alert thread if mp3file changed since the last session
+        self.alerts.configure(self.settings.bad_posture_seconds, self.settings.good_posture_seconds, self.settings.mp3file)
+        # The model loads on a worker thread (usually already warm in the cache) while the page shows a loading state
+        self.stats_label.config(text="Loading model...")
+        self.loading_future = self.controller.run_in_background(
+            self.on_model_loaded, self.controller.model_cache.get_for_settings, self.settings)
+
+    def on_model_loaded(self, future):
+        if future is not self.loading_future:
+            # The page was left while the model was loading; close what it produced so a service
+            # connection does not stay open and count as a client
+            if not future.cancelled() and future.exception() is None:
+                future.result().close()
+            return
+        self.loading_future = None
+        try:
+            self.backend = future.result()
+        except Exception as e:
+            self.stats_label.config(text="")
+            tk.messagebox.showerror("Error", f"Could not load model: {e}")
+            return
+        self.stats_label.config(text="")
+        try:
+            self.videocapture = open_source_for_settings(self.settings)
+        except IOError as e:
+            self.stats_label.config(text="")
+            tk.messagebox.showerror("Error", str(e))
+            return
+        source_info = self.videocapture.describe()
+        self.source_label.config(text=source_info)
+        gate = MotionGate(self.settings.motion_threshold, self.settings.motion_max_stale_frames,
+                          self.settings.motion_min_inference_hz)
+        self.preprocessor = FramePreprocessor(self.settings.image_dimensions)
+        self.metrics = PipelineMetrics()
+        self.metrics_dumper = None
+        if self.settings.metrics_dump_path:
+            self.metrics_dumper = MetricsDumper(self.metrics, self.settings.metrics_dump_path, self.settings.metrics_dump_interval)
+        self.renderer.set_max_fps(self.settings.display_fps)
+        self.pipeline = LivePipeline(self.videocapture, self.predict, gate=gate, metrics=self.metrics)
+        self.pipeline.start()
+        self.render_job = self.after(10, self.update_frame)
 
     def stop_camera(self):
+        self.loading_future = None
+        if self.render_job is not None:
+            self.after_cancel(self.render_job)
+            self.render_job = None
+        if self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
+            print(f'Inference backend {self.backend.name}: {self.backend.mean_latency_ms():.2f} ms per frame')
+        if self.backend is not None:
+            self.backend.close()  # Only the service backend holds a per-session connection
+            self.backend = None
         if self.videocapture is not None:
             self.videocapture.release()
             self.videocapture = None
+        self.source_label.config(text="")
+        self.renderer.reset()
 
     def stop_music(self):
-        pygame.mixer.music.stop()
-        self.sound_played = False
+        self.alerts.silence()
         self.stop_music_button.pack_forget()  # Hide the button when music stops
 
     def reset_timers_and_music(self):
-        self.bad_posture_start_time = None
-        self.good_posture_start_time = None
-        self.stop_music()
+        self.alerts.reset()
+        self.stop_music_button.pack_forget()
+        self.close_warning_message()
 
     def toggle_watch(self):
         self.watching = not self.watching
         self.watch_button.config(text="Stop Watching" if self.watching else "Start Watching")
-        if not self.watching:
-            self.reset_timers_and_music()
+        self.alerts.set_watching(self.watching)
+
+    def apply_alert_events(self):
+        # Widget side of the alert engine; runs on the Tk thread
+        while True:
+            try:
+                event = self.alerts.events.get_nowait()
+            except queue.Empty:
+                return
+            if event == 'alert':
+                self.stop_music_button.pack(side="left", padx=5)  # Show the button when music starts
+                self.focus_force()  # Bring the application window to the front
+                self.show_warning_message()  # Show non-blocking warning message
+            elif event == 'clear':
+                self.stop_music_button.pack_forget()
+                self.close_warning_message()
 
     def show_warning_message(self):
         if self.warning_message is None:
@@ -86,64 +155,54 @@ class LiveViewPage(tk.Frame):
             self.warning_message.destroy()
             self.warning_message = None
 
+    def predict(self, frame):
+        # Runs on the inference worker thread; the preprocessor reuses its buffers on every frame
+        start = time.perf_counter()
+        batch = self.preprocessor(frame)
+        preprocessed = time.perf_counter()
+        predictions = self.backend.predict(batch)
+        self.metrics.record('preprocess', preprocessed - start)
+        self.metrics.record('predict', time.perf_counter() - preprocessed)
+        return predictions
+
     def update_frame(self):
-        if self.videocapture is not None:
-            _, frame = self.videocapture.read()
-            im_color = cv2.flip(frame, flipCode=1)  # flip horizontally
-            im = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            im = cv2.resize(im, self.settings.image_dimensions)
-            im = im / 255  # Normalize the image
-            im = im.reshape(1, self.settings.image_dimensions[0], self.settings.image_dimensions[1], 1)
-            predictions = self.mymodel.predict(im)
-            class_pred = np.argmax(predictions)
-            conf = predictions[0][class_pred]
-            im_color = cv2.resize(im_color, (800, 480), interpolation=cv2.INTER_AREA)
-
-            if class_pred == 1:
-                im_color = cv2.putText(im_color, 'Bad posture', (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), thickness=3)
-                if self.watching:
-                    if self.bad_posture_start_time is None:
-                        self.bad_posture_start_time = time.time()
-                        self.sound_played = False  # Reset the flag when bad posture is detected
-                    elif time.time() - self.bad_posture_start_time > 5:
-                        if not self.sound_played or not pygame.mixer.music.get_busy():
-                            pygame.mixer.music.load(self.settings.mp3file)
-                            pygame.mixer.music.play()
-                            self.sound_played = True  # Set the flag to indicate sound has been played
-                            self.stop_music_button.pack(side="left", padx=5)  # Show the button when music starts
-                            self.focus_force()  # Bring the application window to the front
-                            self.show_warning_message()  # Show non-blocking warning message
-                    self.good_posture_start_time = None  # Reset good posture timer
-            else:
-                im_color = cv2.putText(im_color, 'Good posture', (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), thickness=2)
-                if self.watching:
-                    self.bad_posture_start_time = None
-                    if self.sound_played:
-                        if self.good_posture_start_time is None:
-                            self.good_posture_start_time = time.time()
-                        elif time.time() - self.good_posture_start_time > 3:
-                            self.stop_music()
-                            self.good_posture_start_time = None  # Reset good posture timer after stopping music
-                    else:
-                        self.good_posture_start_time = None
-                    if pygame.mixer.music.get_busy():
-                        self.stop_music()  # Ensure music stops immediately when good posture is detected
-                    if self.warning_message:
-                        self.close_warning_message()  # Close the warning message box
-
-            msg = 'Confidence {}%'.format(round(int(conf * 100)))
-            im_color = cv2.putText(im_color, msg, (15, 110), cv2.FONT_HERSHEY_SIMPLEX, 1, (200, 200, 255), thickness=2)
-            im_color = cv2.cvtColor(im_color, cv2.COLOR_BGR2RGB)
-            im_pil = Image.fromarray(im_color)  # Convert to PIL image
-            img = ImageTk.PhotoImage(image=im_pil)  # Convert to ImageTk
-            self.label.imgtk = img
-            self.label.configure(image=img)
-            self.after(20, self.update_frame)
-
-    def cleanup_threads(self):
-        for thread in self.threads:
-            if thread.is_alive():
-                thread.join()
+        # Render step on the Tk thread: only draws the newest inference result
+        self.render_job = None
+        if self.pipeline is None:
+            return
+        if self.pipeline.error is not None:
+            error = self.pipeline.error
+            self.stop_camera()
+            tk.messagebox.showerror("Error", f"Inference failed: {error}")
+            return
+        result = self.pipeline.next_result()
+        if result is not None:
+            self.alerts.submit(result.class_pred)
+
+            # The alert engine sees every result; drawing is capped separately at display_fps
+            if self.renderer.due():
+                self.render_preview(result)
+            if self.metrics_dumper is not None:
+                self.metrics_dumper.maybe_dump({'backend': self.backend.name})
+        self.apply_alert_events()
+        self.render_job = self.after(10, self.update_frame)
+
+    def render_preview(self, result):
+        render_start = time.perf_counter()
+        texts = prediction_texts(result.class_pred, result.conf)
+        if self.settings.show_stats_overlay:
+            texts += stats_texts(self.metrics.overlay_lines())
+        im_color = self.renderer.compose(result.frame.image, texts)
+        display_start = time.perf_counter()
+        self.renderer.show(im_color)
+        self.metrics.record('overlay', display_start - render_start)
+        self.metrics.record('display', time.perf_counter() - display_start)
+        self.metrics.tick('display')
+
+        stats = self.pipeline.stats()
+        self.stats_label.config(text="{}: {:.1f} ms/frame | Frame age: {:.0f} ms | Reused: {} | Dropped: {}".format(
+            self.backend.name, self.backend.mean_latency_ms(), stats['frame_age_ms'], stats['frames_reused'], stats['frames_dropped']))
 
     def on_close(self):
-        self.cleanup_threads()
+        self.stop_camera()
+        self.alerts.close()
@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import filedialog
-from config import Settings
+from config import Settings, BACKENDS, CAPTURE_FORMATS, CAMERA_CODECS, QUANTIZATION_MODES, ARCHITECTURES
 
 class SettingsPage(tk.Frame):
     def __init__(self, parent, controller, settings):
@@ -11,40 +11,201 @@ class SettingsPage(tk.Frame):
         label = tk.Label(self, text="Settings", font=("Helvetica", 18, "bold"))
         label.pack(side="top", fill="x", pady=10)
 
-        self.image_dimensions_label = tk.Label(self, text="Image Dimensions (width, height):")
-        self.image_dimensions_label.pack(pady=5)
-        self.image_dimensions_entry = tk.Entry(self)
-        self.image_dimensions_entry.pack(pady=5)
-
-        self.epochs_label = tk.Label(self, text="Epochs:")
-        self.epochs_label.pack(pady=5)
-        self.epochs_entry = tk.Entry(self)
-        self.epochs_entry.pack(pady=5)
-
-        self.model_name_label = tk.Label(self, text="Model Name:")
-        self.model_name_label.pack(pady=5)
-        self.model_name_entry = tk.Entry(self)
-        self.model_name_entry.pack(pady=5)
-
-        self.training_dir_label = tk.Label(self, text="Training Directory:")
-        self.training_dir_label.pack(pady=5)
-        self.training_dir_entry = tk.Entry(self, state='readonly')
-        self.training_dir_entry.pack(pady=5)
-        self.training_dir_button = tk.Button(self, text="Browse", command=self.browse_training_dir)
-        self.training_dir_button.pack(pady=5)
-
-        self.mp3file_label = tk.Label(self, text="MP3 File:")
-        self.mp3file_label.pack(pady=5)
-        self.mp3file_entry = tk.Entry(self, state='readonly')
-        self.mp3file_entry.pack(pady=5)
-        self.mp3file_button = tk.Button(self, text="Browse", command=self.browse_mp3file)
-        self.mp3file_button.pack(pady=5)
-
-        save_button = tk.Button(self, text="Save", command=self.save_settings)
-        save_button.pack(pady=10)
-
-        back_button = tk.Button(self, text="Back", command=lambda: controller.show_frame("StartPage"))
-        back_button.pack(pady=10)
+        button_frame = tk.Frame(self)
+        button_frame.pack(side="bottom", pady=5)
+        save_button = tk.Button(button_frame, text="Save", command=self.save_settings)
+        save_button.pack(side="left", padx=5)
+        back_button = tk.Button(button_frame, text="Back", command=lambda: controller.show_frame("StartPage"))
+        back_button.pack(side="left", padx=5)
+
+        # Two-column form inside a scrollable canvas, so Save and Back stay visible however many settings there are
+        self.canvas = tk.Canvas(self, highlightthickness=0)
+        scrollbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="top", fill="both", expand=True)
+        form = tk.Frame(self.canvas)
+        form_window = self.canvas.create_window(0, 0, window=form, anchor="n")
+        form.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self.canvas.bind("<Configure>", lambda e: self.canvas.coords(form_window, e.width // 2, 0))
+        self.canvas.bind("<Enter>", self.bind_mousewheel)
+        self.canvas.bind("<Leave>", self.unbind_mousewheel)
+
+        self.image_dimensions_label = tk.Label(form, text="Image Dimensions (width, height):")
+        self.image_dimensions_label.grid(row=0, column=0, sticky="e", padx=5, pady=3)
+        self.image_dimensions_entry = tk.Entry(form)
+        self.image_dimensions_entry.grid(row=0, column=1, sticky="w", padx=5, pady=3)
+
+        self.epochs_label = tk.Label(form, text="Epochs:")
+        self.epochs_label.grid(row=1, column=0, sticky="e", padx=5, pady=3)
+        self.epochs_entry = tk.Entry(form)
+        self.epochs_entry.grid(row=1, column=1, sticky="w", padx=5, pady=3)
+
+        self.model_name_label = tk.Label(form, text="Model Name:")
+        self.model_name_label.grid(row=2, column=0, sticky="e", padx=5, pady=3)
+        self.model_name_entry = tk.Entry(form)
+        self.model_name_entry.grid(row=2, column=1, sticky="w", padx=5, pady=3)
+
+        self.training_dir_label = tk.Label(form, text="Training Directory:")
+        self.training_dir_label.grid(row=3, column=0, sticky="e", padx=5, pady=3)
+        self.training_dir_entry = tk.Entry(form, state='readonly')
+        self.training_dir_entry.grid(row=3, column=1, sticky="w", padx=5, pady=3)
+        self.training_dir_button = tk.Button(form, text="Browse", command=self.browse_training_dir)
+        self.training_dir_button.grid(row=3, column=2, sticky="w", padx=5, pady=3)
+
+        self.mp3file_label = tk.Label(form, text="MP3 File:")
+        self.mp3file_label.grid(row=4, column=0, sticky="e", padx=5, pady=3)
+        self.mp3file_entry = tk.Entry(form, state='readonly')
+        self.mp3file_entry.grid(row=4, column=1, sticky="w", padx=5, pady=3)
+        self.mp3file_button = tk.Button(form, text="Browse", command=self.browse_mp3file)
+        self.mp3file_button.grid(row=4, column=2, sticky="w", padx=5, pady=3)
+
+        self.inference_backend_label = tk.Label(form, text="Inference Backend:")
+        self.inference_backend_label.grid(row=5, column=0, sticky="e", padx=5, pady=3)
+        self.inference_backend_var = tk.StringVar(self)
+        self.inference_backend_menu = tk.OptionMenu(form, self.inference_backend_var, *BACKENDS)
+        self.inference_backend_menu.grid(row=5, column=1, sticky="w", padx=5, pady=3)
+
+        self.capture_fps_label = tk.Label(form, text="Capture Frames per Second:")
+        self.capture_fps_label.grid(row=6, column=0, sticky="e", padx=5, pady=3)
+        self.capture_fps_entry = tk.Entry(form)
+        self.capture_fps_entry.grid(row=6, column=1, sticky="w", padx=5, pady=3)
+
+        self.capture_format_label = tk.Label(form, text="Capture Format:")
+        self.capture_format_label.grid(row=7, column=0, sticky="e", padx=5, pady=3)
+        self.capture_format_var = tk.StringVar(self)
+        self.capture_format_menu = tk.OptionMenu(form, self.capture_format_var, *CAPTURE_FORMATS)
+        self.capture_format_menu.grid(row=7, column=1, sticky="w", padx=5, pady=3)
+
+        self.jpeg_quality_label = tk.Label(form, text="JPEG Quality (1-100):")
+        self.jpeg_quality_label.grid(row=8, column=0, sticky="e", padx=5, pady=3)
+        self.jpeg_quality_entry = tk.Entry(form)
+        self.jpeg_quality_entry.grid(row=8, column=1, sticky="w", padx=5, pady=3)
+
+        self.validation_split_label = tk.Label(form, text="Validation Split (0-0.5):")
+        self.validation_split_label.grid(row=9, column=0, sticky="e", padx=5, pady=3)
+        self.validation_split_entry = tk.Entry(form)
+        self.validation_split_entry.grid(row=9, column=1, sticky="w", padx=5, pady=3)
+
+        self.early_stopping_patience_label = tk.Label(form, text="Early Stopping Patience (0 = off):")
+        self.early_stopping_patience_label.grid(row=10, column=0, sticky="e", padx=5, pady=3)
+        self.early_stopping_patience_entry = tk.Entry(form)
+        self.early_stopping_patience_entry.grid(row=10, column=1, sticky="w", padx=5, pady=3)
+
+        self.save_best_checkpoint_var = tk.BooleanVar(self)
+        self.save_best_checkpoint_check = tk.Checkbutton(form, text="Save best epoch only", variable=self.save_best_checkpoint_var)
+        self.save_best_checkpoint_check.grid(row=11, column=1, sticky="w", padx=5, pady=3)
+
+        self.motion_threshold_label = tk.Label(form, text="Motion Threshold (0 = infer every frame):")
+        self.motion_threshold_label.grid(row=12, column=0, sticky="e", padx=5, pady=3)
+        self.motion_threshold_entry = tk.Entry(form)
+        self.motion_threshold_entry.grid(row=12, column=1, sticky="w", padx=5, pady=3)
+
+        self.motion_max_stale_frames_label = tk.Label(form, text="Reuse a Prediction for at Most (frames):")
+        self.motion_max_stale_frames_label.grid(row=13, column=0, sticky="e", padx=5, pady=3)
+        self.motion_max_stale_frames_entry = tk.Entry(form)
+        self.motion_max_stale_frames_entry.grid(row=13, column=1, sticky="w", padx=5, pady=3)
+
+        self.motion_min_inference_hz_label = tk.Label(form, text="Minimum Inferences per Second (0 = none):")
+        self.motion_min_inference_hz_label.grid(row=14, column=0, sticky="e", padx=5, pady=3)
+        self.motion_min_inference_hz_entry = tk.Entry(form)
+        self.motion_min_inference_hz_entry.grid(row=14, column=1, sticky="w", padx=5, pady=3)
+
+        self.frame_source_label = tk.Label(form, text="Frame Source (webcam, synthetic or video path):")
+        self.frame_source_label.grid(row=15, column=0, sticky="e", padx=5, pady=3)
+        self.frame_source_entry = tk.Entry(form)
+        self.frame_source_entry.grid(row=15, column=1, sticky="w", padx=5, pady=3)
+
+        self.show_stats_overlay_var = tk.BooleanVar(self)
+        self.show_stats_overlay_check = tk.Checkbutton(form, text="Show performance overlay", variable=self.show_stats_overlay_var)
+        self.show_stats_overlay_check.grid(row=16, column=1, sticky="w", padx=5, pady=3)
+
+        self.metrics_dump_path_label = tk.Label(form, text="Metrics File (.csv or .jsonl, empty = off):")
+        self.metrics_dump_path_label.grid(row=17, column=0, sticky="e", padx=5, pady=3)
+        self.metrics_dump_path_entry = tk.Entry(form)
+        self.metrics_dump_path_entry.grid(row=17, column=1, sticky="w", padx=5, pady=3)
+
+        self.metrics_dump_interval_label = tk.Label(form, text="Metrics File Interval (seconds):")
+        self.metrics_dump_interval_label.grid(row=18, column=0, sticky="e", padx=5, pady=3)
+        self.metrics_dump_interval_entry = tk.Entry(form)
+        self.metrics_dump_interval_entry.grid(row=18, column=1, sticky="w", padx=5, pady=3)
+
+        self.display_fps_label = tk.Label(form, text="Preview Frames per Second:")
+        self.display_fps_label.grid(row=19, column=0, sticky="e", padx=5, pady=3)
+        self.display_fps_entry = tk.Entry(form)
+        self.display_fps_entry.grid(row=19, column=1, sticky="w", padx=5, pady=3)
+
+        self.camera_index_label = tk.Label(form, text="Camera Index:")
+        self.camera_index_label.grid(row=20, column=0, sticky="e", padx=5, pady=3)
+        self.camera_index_entry = tk.Entry(form)
+        self.camera_index_entry.grid(row=20, column=1, sticky="w", padx=5, pady=3)
+
+        self.camera_resolution_label = tk.Label(form, text="Camera Resolution (width, height, empty = default):")
+        self.camera_resolution_label.grid(row=21, column=0, sticky="e", padx=5, pady=3)
+        self.camera_resolution_entry = tk.Entry(form)
+        self.camera_resolution_entry.grid(row=21, column=1, sticky="w", padx=5, pady=3)
+
+        self.camera_fps_label = tk.Label(form, text="Camera FPS (0 = default):")
+        self.camera_fps_label.grid(row=22, column=0, sticky="e", padx=5, pady=3)
+        self.camera_fps_entry = tk.Entry(form)
+        self.camera_fps_entry.grid(row=22, column=1, sticky="w", padx=5, pady=3)
+
+        self.camera_codec_label = tk.Label(form, text="Camera Pixel Format:")
+        self.camera_codec_label.grid(row=23, column=0, sticky="e", padx=5, pady=3)
+        self.camera_codec_var = tk.StringVar(self)
+        self.camera_codec_menu = tk.OptionMenu(form, self.camera_codec_var, *CAMERA_CODECS)
+        self.camera_codec_menu.grid(row=23, column=1, sticky="w", padx=5, pady=3)
+
+        self.camera_buffer_size_label = tk.Label(form, text="Camera Buffer Size (0 = default):")
+        self.camera_buffer_size_label.grid(row=24, column=0, sticky="e", padx=5, pady=3)
+        self.camera_buffer_size_entry = tk.Entry(form)
+        self.camera_buffer_size_entry.grid(row=24, column=1, sticky="w", padx=5, pady=3)
+
+        self.quantization_label = tk.Label(form, text="Quantize After Training:")
+        self.quantization_label.grid(row=25, column=0, sticky="e", padx=5, pady=3)
+        self.quantization_var = tk.StringVar(self)
+        self.quantization_menu = tk.OptionMenu(form, self.quantization_var, *QUANTIZATION_MODES)
+        self.quantization_menu.grid(row=25, column=1, sticky="w", padx=5, pady=3)
+
+        self.architecture_label = tk.Label(form, text="Model Architecture:")
+        self.architecture_label.grid(row=26, column=0, sticky="e", padx=5, pady=3)
+        self.architecture_var = tk.StringVar(self)
+        self.architecture_menu = tk.OptionMenu(form, self.architecture_var, *ARCHITECTURES)
+        self.architecture_menu.grid(row=26, column=1, sticky="w", padx=5, pady=3)
+
+        self.bad_posture_seconds_label = tk.Label(form, text="Alert After Bad Posture (seconds):")
+        self.bad_posture_seconds_label.grid(row=27, column=0, sticky="e", padx=5, pady=3)
+        self.bad_posture_seconds_entry = tk.Entry(form)
+        self.bad_posture_seconds_entry.grid(row=27, column=1, sticky="w", padx=5, pady=3)
+
+        self.good_posture_seconds_label = tk.Label(form, text="Clear After Good Posture (seconds):")
+        self.good_posture_seconds_label.grid(row=28, column=0, sticky="e", padx=5, pady=3)
+        self.good_posture_seconds_entry = tk.Entry(form)
+        self.good_posture_seconds_entry.grid(row=28, column=1, sticky="w", padx=5, pady=3)
+
+        self.service_address_label = tk.Label(form, text="Inference Service Address (host:port):")
+        self.service_address_label.grid(row=29, column=0, sticky="e", padx=5, pady=3)
+        self.service_address_entry = tk.Entry(form)
+        self.service_address_entry.grid(row=29, column=1, sticky="w", padx=5, pady=3)
+
+        self.incremental_training_var = tk.BooleanVar(self)
+        self.incremental_training_check = tk.Checkbutton(form, text="Fine-tune existing model on new images", variable=self.incremental_training_var)
+        self.incremental_training_check.grid(row=30, column=1, sticky="w", padx=5, pady=3)
+
+        self.replay_ratio_label = tk.Label(form, text="Replayed Old Images per New Image:")
+        self.replay_ratio_label.grid(row=31, column=0, sticky="e", padx=5, pady=3)
+        self.replay_ratio_entry = tk.Entry(form)
+        self.replay_ratio_entry.grid(row=31, column=1, sticky="w", padx=5, pady=3)
+
+        self.dedup_threshold_label = tk.Label(form, text="Skip Near-Duplicate Frames (0-255, 0 = off):")
+        self.dedup_threshold_label.grid(row=32, column=0, sticky="e", padx=5, pady=3)
+        self.dedup_threshold_entry = tk.Entry(form)
+        self.dedup_threshold_entry.grid(row=32, column=1, sticky="w", padx=5, pady=3)
+
+        self.dedup_history_label = tk.Label(form, text="Compare With Last Saved Frames (count):")
+        self.dedup_history_label.grid(row=33, column=0, sticky="e", padx=5, pady=3)
+        self.dedup_history_entry = tk.Entry(form)
+        self.dedup_history_entry.grid(row=33, column=1, sticky="w", padx=5, pady=3)
 
         self.load_settings()
 
@@ -52,8 +213,54 @@ class SettingsPage(tk.Frame):
         self.image_dimensions_entry.insert(0, f"{self.settings.image_dimensions[0]},{self.settings.image_dimensions[1]}")
         self.epochs_entry.insert(0, self.settings.epochs)
         self.model_name_entry.insert(0, self.settings.model_name)
-        self.training_dir_entry.insert(0, self.settings.training_dir)
-        self.mp3file_entry.insert(0, self.settings.mp3file)
+        self.set_readonly_entry(self.training_dir_entry, self.settings.training_dir)
+        self.set_readonly_entry(self.mp3file_entry, self.settings.mp3file)
+        self.inference_backend_var.set(self.settings.inference_backend)
+        self.capture_fps_entry.insert(0, self.settings.capture_fps)
+        self.capture_format_var.set(self.settings.capture_format)
+        self.jpeg_quality_entry.insert(0, self.settings.jpeg_quality)
+        self.validation_split_entry.insert(0, self.settings.validation_split)
+        self.early_stopping_patience_entry.insert(0, self.settings.early_stopping_patience)
+        self.save_best_checkpoint_var.set(self.settings.save_best_checkpoint)
+        self.motion_threshold_entry.insert(0, self.settings.motion_threshold)
+        self.motion_max_stale_frames_entry.insert(0, self.settings.motion_max_stale_frames)
+        self.motion_min_inference_hz_entry.insert(0, self.settings.motion_min_inference_hz)
+        self.frame_source_entry.insert(0, self.settings.frame_source)
+        self.show_stats_overlay_var.set(self.settings.show_stats_overlay)
+        self.metrics_dump_path_entry.insert(0, self.settings.metrics_dump_path)
+        self.metrics_dump_interval_entry.insert(0, self.settings.metrics_dump_interval)
+        self.display_fps_entry.insert(0, self.settings.display_fps)
+        self.camera_index_entry.insert(0, self.settings.camera_index)
+        if self.settings.camera_resolution:
+            self.camera_resolution_entry.insert(0, f"{self.settings.camera_resolution[0]},{self.settings.camera_resolution[1]}")
+        self.camera_fps_entry.insert(0, self.settings.camera_fps)
+        self.camera_codec_var.set(self.settings.camera_codec)
+        self.camera_buffer_size_entry.insert(0, self.settings.camera_buffer_size)
+        self.quantization_var.set(self.settings.quantization)
+        self.architecture_var.set(self.settings.architecture)
+        self.bad_posture_seconds_entry.insert(0, self.settings.bad_posture_seconds)
+        self.good_posture_seconds_entry.insert(0, self.settings.good_posture_seconds)
+        self.service_address_entry.insert(0, self.settings.service_address)
+        self.incremental_training_var.set(self.settings.incremental_training)
+        self.replay_ratio_entry.insert(0, self.settings.replay_ratio)
+        self.dedup_threshold_entry.insert(0, self.settings.dedup_threshold)
+        self.dedup_history_entry.insert(0, self.settings.dedup_history)
+
+    def bind_mousewheel(self, event):
+        self.canvas.bind_all("<MouseWheel>", lambda e: self.canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind_all("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind_all("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+
+    def unbind_mousewheel(self, event):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.unbind_all(sequence)
+
+    def set_readonly_entry(self, entry, value):
+        # Read-only entries ignore insert/delete, so unlock them while setting the value
+        entry.config(state='normal')
+        entry.delete(0, tk.END)
+        entry.insert(0, value)
+        entry.config(state='readonly')
 
     def save_settings(self):
         if not self.validate_settings():
@@ -63,6 +270,36 @@ class SettingsPage(tk.Frame):
         self.settings.model_name = self.model_name_entry.get()
         self.settings.training_dir = self.training_dir_entry.get()
         self.settings.mp3file = self.mp3file_entry.get()
+        self.settings.inference_backend = self.inference_backend_var.get()
+        self.settings.capture_fps = float(self.capture_fps_entry.get())
+        self.settings.capture_format = self.capture_format_var.get()
+        self.settings.jpeg_quality = int(self.jpeg_quality_entry.get())
+        self.settings.validation_split = float(self.validation_split_entry.get())
+        self.settings.early_stopping_patience = int(self.early_stopping_patience_entry.get())
+        self.settings.save_best_checkpoint = self.save_best_checkpoint_var.get()
+        self.settings.motion_threshold = float(self.motion_threshold_entry.get())
+        self.settings.motion_max_stale_frames = int(self.motion_max_stale_frames_entry.get())
+        self.settings.motion_min_inference_hz = float(self.motion_min_inference_hz_entry.get())
+        self.settings.frame_source = self.frame_source_entry.get().strip()
+        self.settings.show_stats_overlay = self.show_stats_overlay_var.get()
+        self.settings.metrics_dump_path = self.metrics_dump_path_entry.get().strip()
+        self.settings.metrics_dump_interval = float(self.metrics_dump_interval_entry.get())
+        self.settings.display_fps = float(self.display_fps_entry.get())
+        self.settings.camera_index = int(self.camera_index_entry.get())
+        camera_resolution = self.camera_resolution_entry.get().strip()
+        self.settings.camera_resolution = tuple(map(int, camera_resolution.split(','))) if camera_resolution else None
+        self.settings.camera_fps = float(self.camera_fps_entry.get())
+        self.settings.camera_codec = self.camera_codec_var.get()
+        self.settings.camera_buffer_size = int(self.camera_buffer_size_entry.get())
+        self.settings.quantization = self.quantization_var.get()
+        self.settings.architecture = self.architecture_var.get()
+        self.settings.bad_posture_seconds = float(self.bad_posture_seconds_entry.get())
+        self.settings.good_posture_seconds = float(self.good_posture_seconds_entry.get())
+        self.settings.service_address = self.service_address_entry.get().strip()
+        self.settings.incremental_training = self.incremental_training_var.get()
+        self.settings.replay_ratio = float(self.replay_ratio_entry.get())
+        self.settings.dedup_threshold = float(self.dedup_threshold_entry.get())
+        self.settings.dedup_history = int(self.dedup_history_entry.get())
         self.settings.save_settings()
         messagebox.showinfo("Settings", "Settings saved successfully!")
 
@@ -95,16 +332,165 @@ class SettingsPage(tk.Frame):
             messagebox.showerror("Invalid Input", "MP3 file cannot be empty.")
             return False
 
+        try:
+            capture_fps = float(self.capture_fps_entry.get())
+            if capture_fps <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Capture frames per second must be a positive number.")
+            return False
+
+        try:
+            jpeg_quality = int(self.jpeg_quality_entry.get())
+            if not 1 <= jpeg_quality <= 100:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "JPEG quality must be an integer between 1 and 100.")
+            return False
+
+        try:
+            validation_split = float(self.validation_split_entry.get())
+            if not 0 <= validation_split <= 0.5:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Validation split must be a number between 0 and 0.5.")
+            return False
+
+        try:
+            early_stopping_patience = int(self.early_stopping_patience_entry.get())
+            if early_stopping_patience < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Early stopping patience must be a non-negative integer.")
+            return False
+
+        try:
+            motion_threshold = float(self.motion_threshold_entry.get())
+            if motion_threshold < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Motion threshold must be a non-negative number.")
+            return False
+
+        try:
+            motion_max_stale_frames = int(self.motion_max_stale_frames_entry.get())
+            if motion_max_stale_frames < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Frames a prediction is reused for must be a non-negative integer.")
+            return False
+
+        try:
+            motion_min_inference_hz = float(self.motion_min_inference_hz_entry.get())
+            if motion_min_inference_hz < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Minimum inferences per second must be a non-negative number.")
+            return False
+
+        if not self.frame_source_entry.get().strip():
+            messagebox.showerror("Invalid Input", "Frame source cannot be empty.")
+            return False
+
+        try:
+            metrics_dump_interval = float(self.metrics_dump_interval_entry.get())
+            if metrics_dump_interval <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Metrics file interval must be a positive number of seconds.")
+            return False
+
+        try:
+            display_fps = float(self.display_fps_entry.get())
+            if display_fps <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Preview frames per second must be a positive number.")
+            return False
+
+        try:
+            camera_index = int(self.camera_index_entry.get())
+            if camera_index < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Camera index must be a non-negative integer.")
+            return False
+
+        camera_resolution = self.camera_resolution_entry.get().strip()
+        if camera_resolution:
+            try:
+                camera_resolution = tuple(map(int, camera_resolution.split(',')))
+                if len(camera_resolution) != 2 or any(dim <= 0 for dim in camera_resolution):
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Invalid Input", "Camera resolution must be empty or two positive integers separated by a comma.")
+                return False
+
+        try:
+            camera_fps = float(self.camera_fps_entry.get())
+            if camera_fps < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Camera FPS must be a non-negative number.")
+            return False
+
+        try:
+            camera_buffer_size = int(self.camera_buffer_size_entry.get())
+            if camera_buffer_size < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Camera buffer size must be a non-negative integer.")
+            return False
+
+        try:
+            bad_posture_seconds = float(self.bad_posture_seconds_entry.get())
+            good_posture_seconds = float(self.good_posture_seconds_entry.get())
+            if bad_posture_seconds < 0 or good_posture_seconds < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Posture alert times must be non-negative numbers of seconds.")
+            return False
+
+        try:
+            host, _, port = self.service_address_entry.get().strip().rpartition(':')
+            if not 0 < int(port) < 65536:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Inference service address must look like host:port.")
+            return False
+
+        try:
+            replay_ratio = float(self.replay_ratio_entry.get())
+            if replay_ratio < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Replayed images per new image must be a non-negative number.")
+            return False
+
+        try:
+            dedup_threshold = float(self.dedup_threshold_entry.get())
+            if not 0 <= dedup_threshold <= 255:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Near-duplicate threshold must be a number between 0 and 255.")
+            return False
+
+        try:
+            dedup_history = int(self.dedup_history_entry.get())
+            if dedup_history <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Saved frames to compare with must be a positive integer.")
+            return False
+
         return True
 
     def browse_mp3file(self):
         file_path = filedialog.askopenfilename(filetypes=[("MP3 files", "*.mp3")])
         if file_path:
-            self.mp3file_entry.delete(0, tk.END)
-            self.mp3file_entry.insert(0, file_path)
+            self.set_readonly_entry(self.mp3file_entry, file_path)
 
     def browse_training_dir(self):
         folder_path = filedialog.askdirectory()
         if folder_path:
-            self.training_dir_entry.delete(0, tk.END)
-            self.training_dir_entry.insert(0, folder_path)
+            self.set_readonly_entry(self.training_dir_entry, folder_path)
@@ -1,4 +1,5 @@
 import tkinter as tk
+from tkinter import messagebox
 import os
 from config import Settings  # Import Settings class
 
@@ -15,12 +16,18 @@ class StartPage(tk.Frame):
         training_button.pack(pady=5)
         settings_button = tk.Button(self, text="Settings", command=lambda: controller.show_frame("SettingsPage"))
         settings_button.pack(pady=5)
+        self.status_label = tk.Label(self, text="")
+        self.status_label.pack(pady=5)
 
     def check_model_and_show_live_view(self):
-        if os.path.exists(self.settings.model_name):
+        # With the service backend the model lives wherever serve.py runs, possibly another machine
+        if self.settings.inference_backend == 'service' or os.path.exists(self.settings.model_name):
             self.controller.show_frame("LiveViewPage")
         else:
-            tk.messagebox.showerror("Error", "No trained model found. Please train the model first.")
+            messagebox.showerror("Error", "No trained model found. Please train the model first.")
+
+    def set_status(self, text):
+        self.status_label.config(text=text)
 
     def start_camera(self):
         pass
@@ -1,14 +1,21 @@
 import tkinter as tk
 from tkinter import messagebox
-import threading
-import cv2
 import os
+import threading
+import queue
 import numpy as np
-from tensorflow.keras import layers, models
-from sklearn.utils import class_weight
 from pathlib import Path
 from PIL import Image, ImageTk
 from config import Settings  # Import necessary functions and variables
+from core.dataset import BATCH_SIZE, make_cached_dataset
+from core.incremental import plan_incremental, remove_metadata, save_metadata
+from core.manifest import CLASS_FOLDERS, open_manifest
+from core.dataset_cache import DatasetCache
+from core.capture import CaptureLoop, FrameWriter
+from core.dedup import DuplicateFilter
+from core.preprocessing import model_input_shape
+from core.rendering import PreviewRenderer
+from core.sources import open_source_for_settings
 import json
 
 class TrainingPage(tk.Frame):
@@ -20,7 +27,8 @@ class TrainingPage(tk.Frame):
         label.pack(side="top", fill="x", pady=10)
 
         self.label = tk.Label(self)
-        self.label.pack()
+        self.label.pack(fill="both", expand=True)
+        self.renderer = PreviewRenderer(self.label, self.settings.display_fps, mirror=False)
 
         button_frame = tk.Frame(self)
         button_frame.pack(side="bottom", fill="x", pady=10)
@@ -38,17 +46,25 @@ class TrainingPage(tk.Frame):
         self.stop_button.pack(side="left", padx=5)
         self.stop_button.pack_forget()  # Hide initially
 
+        self.stop_training_button = tk.Button(button_frame, text="Stop Training", command=self.stop_training)
+        self.stop_training_button.pack(side="left", padx=5)
+        self.stop_training_button.pack_forget()  # Hide initially
+
         self.back_button = tk.Button(button_frame, text="Back", command=lambda: controller.show_frame("StartPage"))
         self.back_button.pack(side="left", padx=5)
 
         self.clear_button = tk.Button(button_frame, text="Clear Images", command=self.clear_images)
         self.clear_button.pack(side="left", padx=5)
 
+        self.rescan_button = tk.Button(button_frame, text="Rescan Folders", command=self.rescan_folders)
+        self.rescan_button.pack(side="left", padx=5)
+
         self.progress_label = tk.Label(self, text="")
         self.progress_label.pack(side="top", fill="x", pady=5)
 
-        self.good_image_count = len(os.listdir(f'{self.settings.training_dir}/action_01')) if os.path.exists(f'{self.settings.training_dir}/action_01') else 0
-        self.bad_image_count = len(os.listdir(f'{self.settings.training_dir}/action_02')) if os.path.exists(f'{self.settings.training_dir}/action_02') else 0
+        counts = open_manifest(self.settings.training_dir).counts()  # From the capture log; see rescan_folders
+        self.good_image_count = counts.get('action_01', 0)
+        self.bad_image_count = counts.get('action_02', 0)
 
         self.good_count_label = tk.Label(self, text=f"Good Posture Images: {self.good_image_count}")
         self.good_count_label.pack(side="top", fill="x", pady=5)
@@ -58,12 +74,20 @@ class TrainingPage(tk.Frame):
 
         self.videocapture = None
         self.capturing = False
+        self.capture_loop = None
+        self.writer = None
+        self.capture_action = None
+        self.capture_base_count = 0
+        self.preview_seq = 0
+        self.render_job = None
 
         self.placeholder_image = ImageTk.PhotoImage(Image.new('RGB', self.settings.image_dimensions, color='gray'))
         self.label.configure(image=self.placeholder_image)
 
         self.threads = []
         self.stop_event = threading.Event()
+        self.training_events = queue.Queue()
+        self.training_job = None
 
     def start_camera(self):
         pass
@@ -74,26 +98,33 @@ class TrainingPage(tk.Frame):
             self.videocapture = None
 
     def capture_good_posture(self):
-        self.capturing = True
-        self.disable_buttons()
-        self.stop_button.pack(side="left", padx=5)  # Show stop button
-        thread = threading.Thread(target=self.do_capture_action, args=(1, 'Good'))
-        self.threads.append(thread)
-        thread.start()
+        self.do_capture_action(1, 'Good')
 
     def capture_bad_posture(self):
-        self.capturing = True
-        self.disable_buttons()
-        self.stop_button.pack(side="left", padx=5)  # Show stop button
-        thread = threading.Thread(target=self.do_capture_action, args=(2, 'Bad'))
-        self.threads.append(thread)
-        thread.start()
+        self.do_capture_action(2, 'Bad')
 
     def stop_capture(self):
         self.capturing = False
+        if self.render_job is not None:
+            self.after_cancel(self.render_job)
+            self.render_job = None
+        summary = ""
+        if self.capture_loop is not None:
+            self.capture_loop.stop()
+            duplicates = self.capture_loop.duplicates
+            summary = f"Kept {duplicates.kept} frames, skipped {duplicates.dropped} near-duplicates"
+            self.capture_loop = None
+        if self.writer is not None:
+            self.writer.close()  # Finish the few frames still queued
+            self.update_counts()
+            if self.writer.dropped:
+                print(f'Dropped {self.writer.dropped} frames because the disk could not keep up')
+            self.writer = None
         self.enable_buttons()
+        self.progress_label.config(text=summary)
         self.stop_button.pack_forget()  # Hide stop button
         self.stop_camera()
+        self.renderer.reset()
         self.label.configure(image=self.placeholder_image)
 
     def disable_buttons(self):
@@ -102,6 +133,7 @@ class TrainingPage(tk.Frame):
         self.train_button.config(state=tk.DISABLED)
         self.back_button.config(state=tk.DISABLED)
         self.clear_button.config(state=tk.DISABLED)
+        self.rescan_button.config(state=tk.DISABLED)
 
     def enable_buttons(self):
         self.capture_good_button.config(state=tk.NORMAL)
@@ -109,106 +141,213 @@ class TrainingPage(tk.Frame):
         self.train_button.config(state=tk.NORMAL)
         self.back_button.config(state=tk.NORMAL)
         self.clear_button.config(state=tk.NORMAL)
+        self.rescan_button.config(state=tk.NORMAL)
 
     def train_model(self):
         self.disable_buttons()
         self.progress_label.config(text="Training in progress...")
         self.stop_event.clear()
+        self.stop_training_button.pack(side="left", padx=5)
         thread = threading.Thread(target=self._train_model)
         self.threads.append(thread)
         thread.start()
+        self.training_job = self.after(100, self.poll_training_events)
 
     def do_capture_action(self, action_n, action_label):
-        img_count = 0
         output_folder = f'{self.settings.training_dir}/action_{action_n:02}'
         print(f'Capturing samples for {action_label} into folder {output_folder}')
         Path(output_folder).mkdir(parents=True, exist_ok=True)
 
-        self.videocapture = cv2.VideoCapture(0)
-        if not self.videocapture.isOpened():
-            raise IOError('Cannot open webcam')
-
-        self.update_frame(action_n, output_folder, img_count)
-
-    def update_frame(self, action_n, output_folder, img_count):
-        if self.videocapture is not None and self.capturing:
-            _, frame = self.videocapture.read()
-            filename = f'{output_folder}/{img_count:08}.png'
-            cv2.imwrite(filename, frame)
-            img_count += 1
-
-            if action_n == 1:
-                self.good_image_count += 1
-                self.good_count_label.config(text=f"Good Posture Images: {self.good_image_count}")
-            elif action_n == 2:
-                self.bad_image_count += 1
-                self.bad_count_label.config(text=f"Bad Posture Images: {self.bad_image_count}")
+        try:
+            self.videocapture = open_source_for_settings(self.settings)
+        except IOError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        source_info = self.videocapture.describe()
+        self.progress_label.config(text=source_info)
 
-            im_color = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            im_pil = Image.fromarray(im_color)
-            img = ImageTk.PhotoImage(image=im_pil)
-            self.label.imgtk = img
-            self.label.configure(image=img)
-
-            cv2.waitKey(1000)
-            self.after(20, self.update_frame, action_n, output_folder, img_count)
+        self.capturing = True
+        self.disable_buttons()
+        self.stop_button.pack(side="left", padx=5)  # Show stop button
+        self.capture_action = action_n
+        self.capture_base_count = self.good_image_count if action_n == 1 else self.bad_image_count
+        self.preview_seq = 0
+        self.renderer.set_max_fps(self.settings.display_fps)
+        manifest = open_manifest(self.settings.training_dir)
+        self.writer = FrameWriter(self.settings.capture_format, self.settings.jpeg_quality, self.settings.image_dimensions,
+                                  manifest=manifest)
+        duplicates = DuplicateFilter(self.settings.dedup_threshold, self.settings.dedup_history)
+        self.capture_loop = CaptureLoop(self.videocapture, self.writer, output_folder, self.settings.capture_fps,
+                                        manifest.next_index(f'action_{action_n:02}'), duplicates)
+        self.capture_loop.start()
+        self.update_frame()
+
+    def update_counts(self):
+        count = self.capture_base_count + self.writer.written
+        if self.capture_action == 1:
+            self.good_image_count = count
+            self.good_count_label.config(text=f"Good Posture Images: {self.good_image_count}")
+        elif self.capture_action == 2:
+            self.bad_image_count = count
+            self.bad_count_label.config(text=f"Bad Posture Images: {self.bad_image_count}")
+
+    def update_frame(self):
+        # Preview and counters only; reading the camera and writing files happen off the Tk thread
+        self.render_job = None
+        if self.capture_loop is None or not self.capturing:
+            return
+        if self.writer.error is not None:
+            error = self.writer.error
+            self.stop_capture()
+            messagebox.showerror("Error", f"Saving frames failed: {error}")
+            return
+        self.update_counts()
+        if self.renderer.due():
+            self.preview_seq, frame = self.capture_loop.preview.get_newer(self.preview_seq, timeout=0)
+            if frame is not None:
+                self.renderer.show(self.renderer.compose(frame))
+        self.render_job = self.after(30, self.update_frame)
 
     def _train_model(self):
-        train_images = []
-        train_labels = []
-        class_folders = os.listdir(self.settings.training_dir)
-
-        class_label_indexer = 0
+        # Runs on a worker thread: all widget updates go through self.training_events
+        try:
+            self._run_training()
+        except Exception as e:
+            self.training_events.put(('error', str(e)))
+
+    def _run_training(self):
+        from tensorflow.keras import models, optimizers  # Imported here so opening the page does not load TensorFlow
+        from core.architectures import build_model, format_cost, model_cost
+        from core.training import (FINE_TUNE_LEARNING_RATE, TrainingProgress, balanced_class_weights, make_callbacks,
+                                   split_indices)
+        report = lambda text: self.training_events.put(('progress', text))
+
+        class_folders, train_paths, train_labels = open_manifest(self.settings.training_dir).training_files()
         for c in class_folders:
             print(f'Training with class {c}')
-            for f in os.listdir(f'{self.settings.training_dir}/{c}'):
-                im = cv2.imread(f'{self.settings.training_dir}/{c}/{f}', 0)
-                im = cv2.resize(im, self.settings.image_dimensions)
-                train_images.append(im)
-                train_labels.append(class_label_indexer)
-            class_label_indexer += 1
-
-        train_images = np.array(train_images)
-        train_labels = np.array(train_labels)
-
-        indices = np.arange(train_labels.shape[0])
-        np.random.shuffle(indices)
-        train_images = train_images[indices]
-        train_labels = train_labels[indices]
-        train_images = train_images / 255  # Normalize image
-        n = len(train_images)
-        train_images = train_images.reshape(n, self.settings.image_dimensions[0], self.settings.image_dimensions[1], 1)
-
-        class_weights = class_weight.compute_class_weight('balanced', np.unique(train_labels), train_labels)
-        class_weights_dict = {i: class_weights[i] for i in range(len(class_weights))}
-        model = models.Sequential()
-        model.add(layers.Conv2D(32, (3, 3), activation='relu', input_shape=(self.settings.image_dimensions[0], self.settings.image_dimensions[1], 1)))
-        model.add(layers.MaxPooling2D((2, 2)))
-        model.add(layers.Conv2D(64, (3, 3), activation='relu'))
-        model.add(layers.MaxPooling2D((2, 2)))
-        model.add(layers.Conv2D(64, (3, 3), activation='relu'))
-        model.add(layers.Flatten())
-        model.add(layers.Dense(64, activation='relu'))
-        model.add(layers.Dense(len(class_folders), activation='softmax'))
-        model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
-        for epoch in range(self.settings.epochs):
-            if self.stop_event.is_set():
+        if not train_paths:
+            self.training_events.put(('error', "No captured images found. Please capture some postures first."))
+            return
+        report("Preparing images...")
+        train_images = DatasetCache(self.settings.training_dir, self.settings.image_dimensions).update(train_paths)
+        input_shape = model_input_shape(self.settings.image_dimensions)
+
+        selection = None
+        if self.settings.incremental_training:
+            selection, reason = plan_incremental(self.settings.model_name, class_folders, self.settings.image_dimensions,
+                                                 self.settings.architecture, train_paths, self.settings.replay_ratio)
+            if selection is None:
+                print(f'Full retrain: {reason}')
+            elif not len(selection):
+                self.training_events.put(('error', "No new images since the last training. Capture more postures, "
+                                                   "or turn off fine-tuning in the settings to retrain from scratch."))
+                return
+        if selection is not None:
+            print(f'Fine-tuning {self.settings.model_name} on {len(selection)} of {len(train_paths)} images')
+            report(f"Fine-tuning on {len(selection)} of {len(train_paths)} images...")
+            model = models.load_model(self.settings.model_name)
+            model.compile(optimizer=optimizers.Adam(FINE_TUNE_LEARNING_RATE),
+                          loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+        else:
+            selection = np.arange(len(train_paths))
+            model = build_model(self.settings.architecture, input_shape, len(class_folders))
+
+        train_split, val_split = split_indices(len(selection), self.settings.validation_split)
+        train_indices, val_indices = selection[train_split], selection[val_split]
+        train_dataset = make_cached_dataset(train_images, train_labels, indices=train_indices)
+        val_dataset = make_cached_dataset(train_images, train_labels, shuffle=False, indices=val_indices) if len(val_indices) else None
+        report("Training in progress...")
+
+        class_weights_dict = balanced_class_weights(train_labels[train_indices], len(class_folders))
+
+        progress = TrainingProgress(self.stop_event, report, len(train_indices), BATCH_SIZE, self.settings.epochs)
+        callbacks, checkpoint = make_callbacks(self.settings, progress, val_dataset is not None)
+        model.fit(train_dataset, epochs=self.settings.epochs, validation_data=val_dataset,
+                  class_weight=class_weights_dict, callbacks=callbacks, verbose=0)
+        checkpointed = checkpoint is not None and os.path.exists(checkpoint.filepath)
+        if progress.cancelled and not progress.completed_epochs:
+            # Nothing worth keeping yet: leave the existing model (and its metadata) as they were
+            self.training_events.put(('done', "Training stopped before the first epoch finished; "
+                                              "the existing model was left unchanged."))
+            return
+        if not checkpointed:
+            model.save(self.settings.model_name)
+        else:
+            os.replace(checkpoint.filepath, self.settings.model_name)  # The best completed epoch
+            model = models.load_model(self.settings.model_name)
+        cost = format_cost(self.settings.architecture, model_cost(model, input_shape, self.settings.model_name))
+        print(cost)
+        if self.settings.quantization != 'none' and not progress.cancelled:
+            report(f"Quantizing model ({self.settings.quantization})...")
+            from core.quantization import export_quantized
+            eval_indices = val_indices if len(val_indices) else train_indices
+            export_quantized(model, self.settings.model_name, [self.settings.quantization],
+                             train_images[eval_indices], train_labels[eval_indices],
+                             input_shape)
+        if progress.cancelled:
+            remove_metadata(self.settings.model_name)  # The next run retrains fully rather than trusting a partial model
+        else:
+            save_metadata(self.settings.model_name, class_folders, self.settings.image_dimensions,
+                          self.settings.architecture, train_paths)
+        self.controller.model_cache.warm_up_async(self.settings)
+        if progress.cancelled:
+            self.training_events.put(('done', f"Training stopped; the partially trained model was saved.\n{cost}"))
+        else:
+            self.training_events.put(('done', f"Model training completed successfully!\n{cost}"))
+
+    def poll_training_events(self):
+        # Tk thread side of the training worker: apply queued progress, completion and errors
+        while True:
+            try:
+                kind, text = self.training_events.get_nowait()
+            except queue.Empty:
                 break
-            model.fit(train_images, train_labels, epochs=1, class_weight=class_weights_dict)
-        model.save(self.settings.model_name)
-        self.progress_label.config(text="Training completed successfully!")
+            if kind == 'progress':
+                self.progress_label.config(text=text)
+                continue
+            self.training_job = None
+            self.stop_training_button.pack_forget()
+            self.enable_buttons()
+            if kind == 'done':
+                self.progress_label.config(text=text)
+                messagebox.showinfo("Training", text)
+            else:
+                self.progress_label.config(text="")
+                messagebox.showerror("Training", text)
+            return
+        self.training_job = self.after(100, self.poll_training_events)
+
+    def stop_training(self):
+        self.stop_event.set()
+        self.progress_label.config(text="Stopping training...")
+
+    def rescan_folders(self):
+        # Images copied into or deleted from the class folders by hand are not in the capture log until a rescan,
+        # which lists every folder and so runs on a worker thread
+        self.disable_buttons()
+        self.progress_label.config(text="Rescanning class folders...")
+        self.controller.run_in_background(self.on_rescan_done, open_manifest(self.settings.training_dir).sync)
+
+    def on_rescan_done(self, future):
         self.enable_buttons()
-        messagebox.showinfo("Training", "Model training completed successfully!")
+        try:
+            added, missing = future.result()
+        except Exception as e:
+            self.progress_label.config(text="")
+            messagebox.showerror("Rescan Folders", f"Rescanning the class folders failed: {e}")
+            return
+        counts = open_manifest(self.settings.training_dir).counts()
+        self.good_image_count = counts.get('action_01', 0)
+        self.bad_image_count = counts.get('action_02', 0)
+        self.good_count_label.config(text=f"Good Posture Images: {self.good_image_count}")
+        self.bad_count_label.config(text=f"Bad Posture Images: {self.bad_image_count}")
+        self.progress_label.config(text=f"Found {added} new images, forgot {missing} deleted ones")
 
     def clear_images(self):
         if messagebox.askyesno("Clear Images", "Are you sure you want to clear all captured images?"):
-            for folder in ['action_01', 'action_02']:
-                folder_path = f'{self.settings.training_dir}/{folder}'
-                if os.path.exists(folder_path):
-                    for file in os.listdir(folder_path):
-                        file_path = os.path.join(folder_path, file)
-                        if os.path.isfile(file_path):
-                            os.remove(file_path)
+            open_manifest(self.settings.training_dir).clear(CLASS_FOLDERS)
+            remove_metadata(self.settings.model_name)  # New captures reuse the cleared frame names
+            DatasetCache(self.settings.training_dir, self.settings.image_dimensions).invalidate()
             self.good_image_count = 0
             self.bad_image_count = 0
             self.good_count_label.config(text="Good Posture Images: 0")
@@ -217,6 +356,8 @@ class TrainingPage(tk.Frame):
 
     def cleanup_threads(self):
         self.stop_event.set()
+        if self.capturing:
+            self.stop_capture()
         for thread in self.threads:
             if thread.is_alive():
                 thread.join()
@@ -0,0 +1,51 @@
+"""Post-training quantization of a trained posture model.
+
+Writes dynamic-range and/or int8 TFLite files next to the Keras model (int8 is
+calibrated on a sample of the training images), then compares file size, load
+time, single-frame CPU latency and accuracy against the float model. The table
+is also saved as <model>.quantization.json. Set "Quantize After Training" in
+the settings to have live view load the quantized file.
+
+    python quantize.py --modes dynamic,int8
+    python quantize.py --model posture_model.h5 --data train --eval-samples 1000
+"""
+import argparse
+import sys
+
+from config import Settings
+from core.dataset import list_training_files
+from core.dataset_cache import DatasetCache
+from core.preprocessing import model_input_shape
+from core.quantization import export_quantized
+
+
+def main():
+    settings = Settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=settings.model_name)
+    parser.add_argument('--data', default=settings.training_dir, help='directory of class folders for calibration and accuracy')
+    parser.add_argument('--rescan', action='store_true',
+                        help='pick up images added to or deleted from the class folders by hand')
+    parser.add_argument('--modes', default='dynamic,int8', help='comma separated: dynamic, int8')
+    parser.add_argument('--calibration-samples', type=int, default=200)
+    parser.add_argument('--eval-samples', type=int, default=500)
+    parser.add_argument('--frames', type=int, default=200, help='single-frame predictions timed per model')
+    args = parser.parse_args()
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+
+    from tensorflow.keras import models
+    model = models.load_model(args.model)
+    input_shape = model_input_shape(settings.image_dimensions)
+    if tuple(model.input_shape[1:]) != input_shape:
+        sys.exit(f'Model input shape {model.input_shape[1:]} does not match image_dimensions {settings.image_dimensions}')
+
+    _, paths, labels = list_training_files(args.data, args.rescan)
+    if not paths:
+        sys.exit(f'No images found in {args.data}')
+    images = DatasetCache(args.data, settings.image_dimensions).update(paths)
+    export_quantized(model, args.model, modes, images, labels, input_shape,
+                     args.calibration_samples, args.eval_samples, args.frames)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Local inference service for several live views.
+
+Loads the model once and answers frames from any number of clients, batching
+frames that arrive within --max-wait-ms of each other into one model call.
+Point live view at it with Inference Backend = service and the service
+address in the settings.
+
+    python serve.py --port 8765 --max-batch 8 --max-wait-ms 5
+    python serve.py --model none     # constant-prediction stand-in for testing clients
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from config import Settings
+from core.preprocessing import model_input_shape
+from core.service import InferenceService, make_batch_predictor
+
+
+def main():
+    settings = Settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1', help='use 0.0.0.0 to accept clients from other machines')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--model', default=settings.model_name, help="Keras model file, or 'none' for a stand-in")
+    parser.add_argument('--max-batch', type=int, default=8)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help='how long a frame may wait for others to batch with')
+    parser.add_argument('--report', type=float, default=10.0, help='seconds between throughput reports')
+    args = parser.parse_args()
+
+    input_shape = model_input_shape(settings.image_dimensions)
+    if args.model == 'none':
+        classes = 2
+        predict_batch = lambda batch: np.tile(np.float32([0.3, 0.7]), (len(batch), 1))
+    else:
+        from tensorflow.keras import models
+        model = models.load_model(args.model)
+        if tuple(model.input_shape[1:]) != input_shape:
+            sys.exit(f'Model input shape {model.input_shape[1:]} does not match image_dimensions {settings.image_dimensions}')
+        classes = model.output_shape[-1]
+        predict_batch = make_batch_predictor(model, input_shape)
+        predict_batch(np.zeros((1,) + input_shape, dtype=np.float32))  # trace before the first client arrives
+
+    service = InferenceService(predict_batch, input_shape, classes, args.max_batch, args.max_wait_ms / 1000)
+    host, port = service.start(f'{args.host}:{args.port}')[:2]
+    print(f'Serving {args.model} on {host}:{port} (max batch {args.max_batch}, max wait {args.max_wait_ms} ms)')
+    last = service.stats()
+    try:
+        while True:
+            time.sleep(args.report)
+            stats = service.stats()
+            frames = stats['frames'] - last['frames']
+            batches = stats['batches'] - last['batches']
+            print(f"{stats['clients']} clients, {frames / args.report:.1f} frames/sec, "
+                  f"mean batch {frames / batches if batches else 0:.2f}")
+            last = stats
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+
+
+if __name__ == '__main__':
+    main()
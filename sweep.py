@@ -0,0 +1,155 @@
+"""Hyperparameter sweep with k-fold cross-validation.
+
+Trains every combination of image size, epochs and architecture on each of
+--folds stratified folds of the training images. Folds run in a process
+pool with --threads TensorFlow threads per worker (default: one worker per
+core). Prints a table ranked by mean validation accuracy, then latency, with
+single-frame latency, model file size and parameter count. Decoded images
+are kept per image size in the training directory's cache, as for training,
+so a repeated sweep only decodes new images. --save retrains the winner on
+all images, writes it to Settings.model_name and stores its
+image_dimensions, epochs and architecture in the settings.
+
+    python sweep.py --dimensions 96x96,160x160,224x224 --epochs 5,10 --architectures gap,separable
+    python sweep.py --folds 5 --threads 2 --json sweep.json --save
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from config import ARCHITECTURES, Settings
+from core.dataset import list_training_files
+from core.dataset_cache import DatasetCache
+from core.sources import parse_resolution
+from core.sweep import init_worker, run_fold, train_final
+
+
+def make_folds(labels, folds, seed=0):
+    from sklearn.model_selection import StratifiedKFold
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    return list(splitter.split(np.zeros(len(labels)), labels))
+
+
+def summarize(configs, results):
+    rows = []
+    for key, config in configs.items():
+        folds = [r for r in results if r['key'] == key]
+        if not folds:
+            continue
+        accuracies = [r['accuracy'] for r in folds]
+        cost = next((r for r in folds if 'latency_ms' in r), {})
+        rows.append(dict(config, key=key, folds=len(folds),
+                         accuracy=float(np.mean(accuracies)), accuracy_std=float(np.std(accuracies)),
+                         train_seconds=float(np.mean([r['train_seconds'] for r in folds])),
+                         **{k: cost.get(k) for k in ('latency_ms', 'size_kb', 'params', 'flops')}))
+    # Best accuracy first; among equally accurate models the faster one wins
+    rows.sort(key=lambda r: (-round(r['accuracy'], 3), r['latency_ms'] if r['latency_ms'] is not None else float('inf')))
+    return rows
+
+
+def print_table(rows, threads):
+    print(f"{'rank':>4}  {'size':<9}{'architecture':<13}{'epochs':>6}{'accuracy':>16}"
+          f"{'ms/frame':>10}{'file KB':>9}{'params':>10}{'train s':>9}")
+    for rank, row in enumerate(rows, 1):
+        accuracy = f"{row['accuracy'] * 100:.1f} ± {row['accuracy_std'] * 100:.1f}%"
+        latency = f"{row['latency_ms']:.1f}" if row['latency_ms'] is not None else '-'
+        size = f"{row['size_kb']:.0f}" if row['size_kb'] is not None else '-'
+        params = f"{row['params'] / 1e6:.2f}M" if row['params'] is not None else '-'
+        print(f"{rank:>4}  {row['dimensions']:<9}{row['architecture']:<13}{row['epochs']:>6}{accuracy:>16}"
+              f"{latency:>10}{size:>9}{params:>10}{row['train_seconds']:>9.0f}")
+    print(f'(latency measured with {threads} TensorFlow thread(s) per worker)')
+
+
+def main():
+    settings = Settings()
+    current = f'{settings.image_dimensions[0]}x{settings.image_dimensions[1]}'
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default=settings.training_dir, help='directory of class folders')
+    parser.add_argument('--rescan', action='store_true',
+                        help='pick up images added to or deleted from the class folders by hand')
+    parser.add_argument('--dimensions', default=current, help='comma separated WxH image sizes')
+    parser.add_argument('--epochs', default=str(settings.epochs), help='comma separated epoch counts')
+    parser.add_argument('--architectures', default=','.join(ARCHITECTURES))
+    parser.add_argument('--folds', type=int, default=3)
+    parser.add_argument('--threads', type=int, default=1, help='TensorFlow intra/inter-op threads per worker')
+    parser.add_argument('--workers', type=int, default=None, help='parallel trainings (default: cores / threads)')
+    parser.add_argument('--json', default=None, help='also write the ranked results to this file')
+    parser.add_argument('--save', action='store_true', help='retrain the winner on all images and save it as the model')
+    args = parser.parse_args()
+
+    dimensions = [parse_resolution(d) for d in args.dimensions.split(',')]
+    epochs = [int(e) for e in args.epochs.split(',')]
+    architectures = [a.strip() for a in args.architectures.split(',')]
+    unknown = set(architectures) - set(ARCHITECTURES)
+    if unknown:
+        sys.exit(f'Unknown architectures: {", ".join(sorted(unknown))}')
+    workers = args.workers or max((os.cpu_count() or 1) // args.threads, 1)
+
+    class_names, paths, labels = list_training_files(args.data, args.rescan)
+    if not paths:
+        sys.exit(f'No images found in {args.data}')
+    folds = make_folds(labels, args.folds)
+    print(f'{len(paths)} images in {len(class_names)} classes, {args.folds} folds, {workers} workers x {args.threads} threads')
+
+    # Decoded into the training cache once (or reused from it); every worker memory-maps the same file
+    cached_images = {dims: DatasetCache(args.data, dims).update(paths, keep_other_dimensions=True) for dims in dimensions}
+
+    configs = {}
+    tasks = []
+    for dims, n_epochs, architecture in itertools.product(dimensions, epochs, architectures):
+        key = f'{dims[0]}x{dims[1]}-{architecture}-{n_epochs}'
+        configs[key] = {'dimensions': f'{dims[0]}x{dims[1]}', 'architecture': architecture, 'epochs': n_epochs}
+        for fold, (train_indices, val_indices) in enumerate(folds):
+            tasks.append({'key': key, 'fold': fold, 'images': cached_images[dims], 'labels': labels,
+                          'train_indices': train_indices, 'val_indices': val_indices,
+                          'architecture': architecture, 'epochs': n_epochs, 'n_classes': len(class_names),
+                          'threads': args.threads, 'measure_cost': fold == 0})
+
+    # spawn: TensorFlow is not fork-safe, and each worker must configure its threads before importing it
+    context = multiprocessing.get_context('spawn')
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=init_worker, initargs=(args.threads,)) as executor:
+        futures = [executor.submit(run_fold, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            print(f"[{done}/{len(tasks)}] {result['key']} fold {result['fold'] + 1}: "
+                  f"accuracy {result['accuracy'] * 100:.1f}% ({time.perf_counter() - start:.0f} s elapsed)")
+
+        rows = summarize(configs, results)
+        print_table(rows, args.threads)
+        if args.json:
+            with open(args.json, 'w') as file:
+                json.dump({'classes': class_names, 'folds': args.folds, 'threads': args.threads, 'results': rows},
+                          file, indent=2)
+
+        if args.save and rows:
+            winner = rows[0]
+            dims = parse_resolution(winner['dimensions'])
+            print(f"Retraining {winner['key']} on all images...")
+            executor.submit(train_final, {
+                'images': cached_images[dims], 'labels': labels, 'architecture': winner['architecture'],
+                'epochs': winner['epochs'], 'n_classes': len(class_names), 'threads': args.threads,
+                'model_path': settings.model_name}).result()
+
+    if args.save and rows:
+        from core.incremental import save_metadata
+        settings.image_dimensions = dims
+        settings.epochs = winner['epochs']
+        settings.architecture = winner['architecture']
+        settings.save_settings()
+        save_metadata(settings.model_name, class_names, dims, winner['architecture'], paths)
+        print(f"Saved {settings.model_name} ({winner['key']}) and updated the settings")
+
+
+if __name__ == '__main__':
+    main()